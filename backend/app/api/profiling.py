@@ -0,0 +1,74 @@
+"""FastAPI side of request profiling: the middleware and the route class."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+from ..profiling import profile_block, profiled
+
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingRoute(APIRoute):
+    """Route whose endpoint runs under the request's profiler.
+
+    cProfile only sees the thread it is enabled in, and sync endpoints run in
+    the threadpool, so the endpoint itself is wrapped rather than the middleware.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Dependencies are already resolved from the original signature; the
+        # request handler reads ``dependant.call`` at call time.
+        self.dependant.call = profiled(self.dependant.call)
+
+
+def profiling_requested(headers: dict[str, str]) -> bool:
+    settings = get_settings()
+    if settings.profiling_enabled:
+        return True
+    return settings.profiling_allow_header and headers.get(PROFILE_HEADER, "") in {"1", "true"}
+
+
+class ProfilingMiddleware:
+    """Profiles requests when ``PROFILING_ENABLED`` is set or, if
+    ``PROFILING_ALLOW_HEADER`` is set, when the client sends ``X-Profile: 1``.
+
+    The summary is stored in ``profile_store`` and announced through
+    ``X-Profile-Id`` and ``Server-Timing`` response headers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        if not profiling_requested(headers):
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        with profile_block(label, profile_current_thread=False) as session:
+
+            async def send_with_profile(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    elapsed = (time.perf_counter() - session.started) * 1000
+                    timing = (
+                        f'total;dur={elapsed:.1f}, '
+                        f'sql;dur={session.sql_ms:.1f};desc="{len(session.queries)} queries"'
+                    )
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-profile-id", session.id.encode()),
+                        (b"server-timing", timing.encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_profile)
@@ -1,25 +1,73 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+import tempfile
+
+from typing import Callable, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy.orm import Session
 
-from ..db import get_db
-from ..models import RequestStatus
+from ..cache import (
+    HELP_REQUEST_ROUTE,
+    KNOWLEDGE_BASE_ROUTE,
+    ResponseCache,
+    get_response_cache,
+)
+from ..db import get_db, get_session_factory
+from ..models import HelpRequest, RequestStatus
+from ..profiling import profile_store
+from ..services.coordination import get_knowledge_base_watcher
+from ..services.exports import MEDIA_TYPES
 from ..services.help_requests import HelpRequestService
+from ..services.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyService,
+)
+from ..services.knowledge_base import ImportResult, KnowledgeBaseImporter
+from ..services.retention import ArchivalService
+from ..services.stats import StatsService
+from .profiling import ProfilingRoute
 from .schemas import (
+    ArchiveResultView,
     HelpRequestCreate,
     HelpRequestView,
     KnowledgeBaseEntryView,
+    KnowledgeBaseImportResult,
+    RecordFormat,
+    StatsView,
     SupervisorResponseCreate,
 )
 
-router = APIRouter(prefix="/api", tags=["help-requests"])
+router = APIRouter(prefix="/api", tags=["help-requests"], route_class=ProfilingRoute)
+
+_knowledge_base_adapter = TypeAdapter(list[KnowledgeBaseEntryView])
 
 
 def _service(session: Session) -> HelpRequestService:
     return HelpRequestService(session=session)
 
 
+def _export_response(
+    name: str, fmt: RecordFormat, export, session_factory: Callable
+) -> StreamingResponse:
+    # The request-scoped session from ``get_db`` is closed before the body is
+    # streamed, so the generator owns a session for the lifetime of the stream.
+    def rows():
+        with session_factory() as session:
+            yield from export(_service(session))
+
+    return StreamingResponse(
+        rows(),
+        media_type=MEDIA_TYPES[fmt.value],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'},
+    )
+
+
 @router.get("/help-requests", response_model=list[HelpRequestView])
 def list_help_requests(
     status: RequestStatus | None = None,
@@ -29,19 +77,89 @@ def list_help_requests(
     return service.list_requests(status=status)
 
 
+@router.get("/help-requests/export")
+def export_help_requests(
+    format: RecordFormat = RecordFormat.ndjson,
+    status: RequestStatus | None = None,
+    session_factory: Callable = Depends(get_session_factory),
+):
+    return _export_response(
+        "help-requests",
+        format,
+        lambda service: service.export_requests(fmt=format.value, status=status),
+        session_factory,
+    )
+
+
 @router.get("/help-requests/{request_id}", response_model=HelpRequestView)
 def get_help_request(request_id: str, db: Session = Depends(get_db)):
     service = _service(db)
+
+    def load() -> bytes:
+        request = service.get_request(request_id)
+        return HelpRequestView.model_validate(request, from_attributes=True).model_dump_json().encode()
+
     try:
-        return service.get_request(request_id)
+        body = get_response_cache().get_or_set(
+            ResponseCache.key(HELP_REQUEST_ROUTE, request_id=request_id), load
+        )
     except ValueError as exc:  # pragma: no cover - FastAPI handles
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return Response(content=body, media_type="application/json")
+
+
+def _idempotent(
+    db: Session,
+    *,
+    scope: str,
+    key: Optional[str],
+    payload: BaseModel,
+    status_code: int,
+    run: Callable[[], HelpRequest],
+):
+    """Run ``run`` once per ``Idempotency-Key``; retries replay the stored body.
+
+    The key and the response are written in the request's transaction, so if
+    ``run`` fails nothing is remembered and a retry executes normally.
+    """
+    if not key:
+        return run()
+    idempotency = IdempotencyService(db)
+    try:
+        stored = idempotency.begin(scope, key, payload.model_dump_json())
+    except IdempotencyKeyMismatch as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+    except IdempotencyKeyInProgress as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    if stored:
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+    body = HelpRequestView.model_validate(run(), from_attributes=True).model_dump_json()
+    idempotency.complete(scope, key, status_code=status_code, body=body)
+    return Response(content=body, status_code=status_code, media_type="application/json")
 
 
 @router.post("/help-requests", response_model=HelpRequestView, status_code=status.HTTP_201_CREATED)
-def create_help_request(payload: HelpRequestCreate, db: Session = Depends(get_db)):
+def create_help_request(
+    payload: HelpRequestCreate,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    db: Session = Depends(get_db),
+):
     service = _service(db)
-    return service.create_escalation(**payload.dict())
+    return _idempotent(
+        db,
+        scope="help-requests:create",
+        key=idempotency_key,
+        payload=payload,
+        status_code=status.HTTP_201_CREATED,
+        run=lambda: service.create_escalation(**payload.dict()),
+    )
 
 
 @router.post(
@@ -51,17 +169,29 @@ def create_help_request(payload: HelpRequestCreate, db: Session = Depends(get_db
 def submit_response(
     request_id: str,
     payload: SupervisorResponseCreate,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
     db: Session = Depends(get_db),
 ):
     service = _service(db)
-    try:
-        updated, kb_entry = service.record_response(
-            request_id,
-            **payload.dict(),
-        )
-    except ValueError as exc:  # pragma: no cover
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
-    return updated
+
+    def respond() -> HelpRequest:
+        try:
+            updated, kb_entry = service.record_response(
+                request_id,
+                **payload.dict(),
+            )
+        except ValueError as exc:  # pragma: no cover
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+        return updated
+
+    return _idempotent(
+        db,
+        scope=f"help-requests:{request_id}:response",
+        key=idempotency_key,
+        payload=payload,
+        status_code=status.HTTP_200_OK,
+        run=respond,
+    )
 
 
 @router.post("/help-requests/{request_id}/timeout", response_model=HelpRequestView)
@@ -77,10 +207,73 @@ def timeout_request(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
 
 
+@router.post("/help-requests/archive", response_model=ArchiveResultView)
+def archive_help_requests(
+    retention_days: int | None = Query(default=None, ge=1),
+    db: Session = Depends(get_db),
+):
+    return ArchivalService(db, retention_days=retention_days).archive_expired()
+
+
 @router.get("/knowledge-base", response_model=list[KnowledgeBaseEntryView])
 def list_knowledge_base(db: Session = Depends(get_db)):
     service = _service(db)
-    return service.list_knowledge_base()
+
+    def load() -> bytes:
+        entries = _knowledge_base_adapter.validate_python(
+            service.list_knowledge_base(), from_attributes=True
+        )
+        return _knowledge_base_adapter.dump_json(entries)
+
+    get_knowledge_base_watcher().poll(db)
+    body = get_response_cache().get_or_set(ResponseCache.key(KNOWLEDGE_BASE_ROUTE), load)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/knowledge-base/export")
+def export_knowledge_base(
+    format: RecordFormat = RecordFormat.ndjson,
+    session_factory: Callable = Depends(get_session_factory),
+):
+    return _export_response(
+        "knowledge-base",
+        format,
+        lambda service: service.export_knowledge_base(fmt=format.value),
+        session_factory,
+    )
+
+
+def _import_spooled(
+    spool: tempfile.SpooledTemporaryFile,
+    fmt: RecordFormat,
+    chunk_size: int | None,
+    session_factory: Callable,
+) -> ImportResult:
+    lines = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    with session_factory() as session:
+        importer = KnowledgeBaseImporter(session, chunk_size=chunk_size)
+        return importer.import_lines(lines, fmt=fmt.value)
+
+
+@router.post("/knowledge-base/import", response_model=KnowledgeBaseImportResult)
+async def import_knowledge_base(
+    request: Request,
+    format: RecordFormat = RecordFormat.ndjson,
+    chunk_size: int | None = Query(default=None, ge=1),
+    session_factory: Callable = Depends(get_session_factory),
+):
+    # Spool the upload (spilling to disk past 8 MiB) so large files are never
+    # held in memory, then stream it through the importer off the event loop.
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            return await run_in_threadpool(
+                _import_spooled, spool, format, chunk_size, session_factory
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.post("/help-requests/follow-ups/dispatch")
@@ -88,3 +281,27 @@ def dispatch_follow_ups(db: Session = Depends(get_db)) -> dict[str, int]:
     service = _service(db)
     sent = service.send_due_follow_up_reminders()
     return {"sent": sent}
+
+
+@router.get("/stats", response_model=StatsView)
+def get_stats(db: Session = Depends(get_db)):
+    return StatsService(db).summary()
+
+
+@router.post("/stats/rebuild", response_model=StatsView)
+def rebuild_stats(db: Session = Depends(get_db)):
+    return StatsService(db).rebuild()
+
+
+@router.get("/debug/profiles")
+def list_profiles() -> list[dict]:
+    """Recent request and agent-turn profiles, newest first."""
+    return profile_store.list()
+
+
+@router.get("/debug/profiles/{profile_id}")
+def get_profile(profile_id: str) -> dict:
+    summary = profile_store.get(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return summary
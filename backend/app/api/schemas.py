@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from enum import Enum
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
-from ..models import HistoryEntry, RequestStatus
+from ..models import HistoryEntry, RequestStatus, SupervisorResponse
+
+
+class RecordFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
 
 
 class HelpRequestCreate(BaseModel):
@@ -38,6 +44,41 @@ class HelpRequestView(BaseModel):
     history: List[HistoryEntry]
     follow_up_at: Optional[datetime]
     follow_up_reminder_sent: bool
+    coalesced_into: Optional[str] = None
+    responses: List[SupervisorResponse] = Field(default_factory=list)
+
+    class Config:
+        from_attributes = True
+
+
+class KnowledgeBaseImportResult(BaseModel):
+    processed: int
+    batches: int
+
+
+class ArchiveResultView(BaseModel):
+    archived: int
+    batches: int
+    path: Optional[str]
+    vacuumed: bool
+
+
+class LatencyStatsView(BaseModel):
+    count: int
+    mean_seconds: Optional[float]
+    percentiles: Dict[str, Optional[float]]
+
+    class Config:
+        from_attributes = True
+
+
+class StatsView(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_channel: Dict[str, int]
+    by_topic: Dict[str, int]
+    resolution_rate: Optional[float]
+    time_to_resolve: LatencyStatsView
 
     class Config:
         from_attributes = True
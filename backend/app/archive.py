@@ -0,0 +1,42 @@
+"""Command-line entry point for the help-request retention job.
+
+Usage::
+
+    python -m app.archive              # uses RETENTION_DAYS
+    python -m app.archive --days 90
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Archive old resolved/unresolved help requests.")
+    parser.add_argument("--days", type=int, default=None, help="Override RETENTION_DAYS")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from .db import db_session
+    from .repository import init_db
+    from .services.retention import ArchivalService
+
+    init_db()
+    with db_session() as session:
+        service = ArchivalService(
+            session, retention_days=args.days, batch_size=args.batch_size
+        )
+        if not service.retention_days:
+            print("Retention is disabled; set RETENTION_DAYS or pass --days.", file=sys.stderr)
+            return 1
+        result = service.archive_expired()
+    if result.archived:
+        print(f"Archived {result.archived} requests in {result.batches} batches to {result.path}.")
+    else:
+        print("Nothing to archive.")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""In-process cache for serialized read-endpoint responses.
+
+Entries are keyed by route name plus parameters and hold the exact JSON bytes
+returned to clients, so a hit skips both the database and Pydantic. Write paths
+in ``HelpRequestService`` invalidate the keys they touch.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+
+HELP_REQUEST_ROUTE = "help-request"
+KNOWLEDGE_BASE_ROUTE = "knowledge-base"
+
+
+class CacheBackend:
+    """Pluggable byte store. Subclass to back the cache with Redis, memcached, etc."""
+
+    def get(self, key: str) -> Optional[bytes]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    def clear(self) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        return None
+
+    def delete(self, key: str) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+
+class InMemoryTTLCache(CacheBackend):
+    """Thread-safe LRU with a per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+CACHE_BACKENDS: dict[str, Callable[[int], CacheBackend]] = {
+    "memory": InMemoryTTLCache,
+    "none": lambda _max_entries: NullCache(),
+}
+
+
+def register_cache_backend(name: str, factory: Callable[[int], CacheBackend]) -> None:
+    CACHE_BACKENDS[name] = factory
+
+
+class ResponseCache:
+    """Serialized responses plus per-key generations guarding against stale fills.
+
+    ``invalidate`` bumps the key's generation, and ``get_or_set`` only stores
+    what it loaded if the generation has not moved meanwhile. A reader that
+    loaded the pre-commit row therefore cannot re-cache it after the
+    writer's after-commit invalidation. Generations live in a fixed number of
+    hashed slots, so an unrelated invalidation can at worst skip one fill.
+    """
+
+    GENERATION_SLOTS = 1024
+
+    def __init__(self, backend: CacheBackend, *, ttl_seconds: float) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._generations = [0] * self.GENERATION_SLOTS
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(route: str, **params: object) -> str:
+        return f"{route}?{urlencode(sorted(params.items()))}"
+
+    def get_or_set(self, key: str, loader: Callable[[], bytes]) -> bytes:
+        cached = self.backend.get(key)
+        if cached is not None:
+            return cached
+        slot = self._slot(key)
+        with self._lock:
+            generation = self._generations[slot]
+        value = loader()
+        with self._lock:
+            if self._generations[slot] == generation:
+                self.backend.set(key, value, self.ttl_seconds)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._generations[self._slot(key)] += 1
+                self.backend.delete(key)
+
+    def invalidate_after_commit(self, session: Session, *keys: str) -> None:
+        """Drop ``keys`` now and again once the write is committed.
+
+        The second pass bumps the generation, so a concurrent reader that
+        loaded the pre-commit state does not store it afterwards.
+        """
+        self.invalidate(*keys)
+        event.listen(session, "after_commit", lambda _session: self.invalidate(*keys), once=True)
+
+    def _slot(self, key: str) -> int:
+        return hash(key) % self.GENERATION_SLOTS
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generations = [generation + 1 for generation in self._generations]
+            self.backend.clear()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    from .services.knowledge_base import on_knowledge_base_changed
+
+    settings = get_settings()
+    try:
+        factory = CACHE_BACKENDS[settings.response_cache_backend]
+    except KeyError as exc:
+        raise RuntimeError(
+            f"Unknown response cache backend '{settings.response_cache_backend}'"
+        ) from exc
+    cache = ResponseCache(
+        factory(settings.response_cache_max_entries),
+        ttl_seconds=settings.response_cache_ttl_seconds,
+    )
+    on_knowledge_base_changed(lambda: cache.invalidate(ResponseCache.key(KNOWLEDGE_BASE_ROUTE)))
+    return cache
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -15,14 +15,54 @@ class Settings(BaseSettings):
     database_url: str = Field(
         default=f"sqlite:///{Path(__file__).resolve().parent.parent / 'data' / 'app.db'}"
     )
+    # Connection pool tuning; ignored for SQLite, which uses SQLAlchemy's defaults.
+    db_pool_size: int = Field(default=10, ge=1)
+    db_max_overflow: int = Field(default=20, ge=0)
+    db_pool_timeout_seconds: float = Field(default=30.0, gt=0)
+    db_pool_recycle_seconds: int = Field(default=1800)
+    db_pool_pre_ping: bool = Field(default=True)
     livekit_url: str = Field(default="wss://example.livekit.dev")
     livekit_api_key: str = Field(default="demo-key")
     livekit_api_secret: str = Field(default="demo-secret")
     request_timeout_minutes: int = Field(default=30)
+    # How long a live call stays on the line for a supervisor answer after
+    # escalating; 0 (the default) hangs up straight after the holding message.
+    # Answers are pushed only within one process, so enable this when the API
+    # and the LiveKit worker share a process; otherwise the answer is only seen
+    # by the check made when the wait runs out.
+    in_call_resolution_wait_seconds: float = Field(default=0.0, ge=0)
+    # Identical escalations within this window share one supervisor task; 0 disables.
+    escalation_coalesce_window_seconds: int = Field(default=300, ge=0)
+    follow_up_dispatch_batch_size: int = Field(default=100, ge=1)
+    # How long a POST's Idempotency-Key is remembered and its response replayed.
+    idempotency_key_ttl_seconds: int = Field(default=86400, ge=1)
     knowledge_base_auto_tag: str = Field(default="General")
+    knowledge_base_import_chunk_size: int = Field(default=1000, ge=1)
     post_resolution_followup: str = Field(
         default="Thanks for reaching out! If you have any more questions, feel free to contact me anytime — I'm here for you."
     )
+    # Resolved/unresolved requests older than this many days are moved out of the
+    # hot tables into gzipped NDJSON files under ``archive_dir``. Unset disables it.
+    retention_days: Optional[int] = Field(default=None, ge=1)
+    retention_batch_size: int = Field(default=500, ge=1)
+    archive_dir: str = Field(
+        default=str(Path(__file__).resolve().parent.parent / "data" / "archive")
+    )
+    # Serialized responses of hot read endpoints; "none" disables caching.
+    response_cache_backend: str = Field(default="memory")
+    response_cache_ttl_seconds: float = Field(default=30.0, ge=0)
+    response_cache_max_entries: int = Field(default=1024, ge=1)
+    # Follow-up dispatch and timeout sweeping run in whichever process holds the
+    # maintenance lease; enable the scheduler in every API process that may run it.
+    scheduler_enabled: bool = Field(default=False)
+    scheduler_interval_seconds: float = Field(default=30.0, gt=0)
+    scheduler_lease_seconds: float = Field(default=90.0, gt=0)
+    change_poll_interval_seconds: float = Field(default=2.0, ge=0)
+    # Profile every request and agent turn (cProfile + SQL timings), or only
+    # requests carrying ``X-Profile: 1`` when the header toggle is allowed.
+    profiling_enabled: bool = Field(default=False)
+    profiling_allow_header: bool = Field(default=False)
+    profiling_top_functions: int = Field(default=15, ge=0)
     allowed_origins: List[str] = Field(
         default_factory=lambda: [
             "http://localhost:3000",
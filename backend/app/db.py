@@ -1,17 +1,50 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
+from contextlib import AbstractContextManager, contextmanager
+from functools import lru_cache
+from typing import Callable
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from .config import get_settings
 
-settings = get_settings()
-engine = create_engine(settings.database_url, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
 
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """Create the engine on first use rather than at import time."""
+    settings = get_settings()
+    options: dict = {}
+    if not settings.database_url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    return create_engine(settings.database_url, echo=False, future=True, **options)
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(bind=get_engine(), autoflush=False, autocommit=False, future=True)
+
+
+def SessionLocal() -> Session:
+    return get_sessionmaker()()
+
+
+def __getattr__(name: str):
+    # Backwards compatibility for ``from app.db import engine``.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 @contextmanager
 def db_session() -> Session:
     session: Session = SessionLocal()
@@ -25,6 +58,12 @@ def db_session() -> Session:
         session.close()
 
 
+def get_session_factory() -> Callable[[], AbstractContextManager[Session]]:
+    """Dependency for endpoints that open their own sessions, e.g. for the
+    lifetime of a streamed response rather than the request."""
+    return db_session
+
+
 def get_db():
     session: Session = SessionLocal()
     try:
@@ -0,0 +1,49 @@
+"""Command-line bulk import for knowledge-base entries.
+
+Usage::
+
+    python -m app.kb_import faq.ndjson
+    python -m app.kb_import faq.csv --format csv --chunk-size 2000
+    cat faq.ndjson | python -m app.kb_import -
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import knowledge-base entries.")
+    parser.add_argument("path", help="NDJSON/CSV file to import, or '-' for stdin")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from .db import db_session
+    from .repository import init_db
+    from .services.knowledge_base import KnowledgeBaseImporter
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    init_db()
+    stream = (
+        sys.stdin
+        if args.path == "-"
+        else open(args.path, encoding="utf-8", newline="")
+    )
+    try:
+        with db_session() as session:
+            importer = KnowledgeBaseImporter(session, chunk_size=args.chunk_size)
+            result = importer.import_lines(stream, fmt=fmt)
+    except ValueError as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    print(f"Imported {result.processed} entries in {result.batches} batches.")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import time
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-try:  # pragma: no cover - optional dependency at runtime
+# Only stdlib at module level: the LiveKit SDK and the service/database stack
+# are imported on first use so ``--help`` and job dispatch start fast.
+if TYPE_CHECKING:  # pragma: no cover
     from livekit import agents
-    from livekit.agents import cli
-except ImportError:  # pragma: no cover
-    agents = None
-    cli = None
 
-from .services.livekit_agent import LiveKitAgentBridge
+    from .services.livekit_agent import LiveKitAgentBridge
+
+logger = logging.getLogger(__name__)
+
+HOLDING_MESSAGE = "Let me check with my supervisor and get back to you shortly."
 
 
 @dataclass
@@ -22,10 +26,52 @@ class IncomingCall:
     customer_contact: str | None = None
 
 
-async def handle_job(job: "agents.JobRequest", ctx: "agents.JobContext") -> None:
-    """Entry point for LiveKit jobs."""
+@dataclass
+class CallTimings:
+    """Per-call latency breakdown, logged at the end of every job."""
+
+    path: str = "knowledge_base"
+    knowledge_base_ms: float = 0.0
+    time_to_first_reply_ms: float = 0.0
+    escalation_ms: Optional[float] = None
+    resolution_ms: Optional[float] = None
+
+    @property
+    def saved_ms(self) -> float:
+        """How much sooner the caller heard us than with a blocking escalation."""
+        if self.escalation_ms is None:
+            return 0.0
+        return max(self.knowledge_base_ms + self.escalation_ms - self.time_to_first_reply_ms, 0.0)
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+async def handle_job(
+    job: "agents.JobRequest",
+    ctx: "agents.JobContext",
+    bridge: Optional[LiveKitAgentBridge] = None,
+    resolution_wait_seconds: Optional[float] = None,
+) -> CallTimings:
+    """Entry point for LiveKit jobs.
 
-    bridge = LiveKitAgentBridge()
+    On a knowledge-base miss the holding message goes out straight away while
+    the escalation is persisted and the supervisor notified in a worker thread,
+    so the caller never waits on database writes or notification sinks. The call
+    then stays open for up to ``in_call_resolution_wait_seconds`` in case the
+    supervisor answers while the caller is still on the line. Interim answers
+    are spoken without ending that wait.
+    """
+
+    if bridge is None:
+        from .services.livekit_agent import LiveKitAgentBridge
+
+        bridge = LiveKitAgentBridge()
+    if resolution_wait_seconds is None:
+        resolution_wait_seconds = bridge.settings.in_call_resolution_wait_seconds
+    started = time.perf_counter()
+    timings = CallTimings()
     metadata: Dict[str, Any] = job.input or {}
     call = IncomingCall(
         customer_name=metadata.get("customer_name", "Unknown Caller"),
@@ -34,26 +80,82 @@ async def handle_job(job: "agents.JobRequest", ctx: "agents.JobContext") -> None
         customer_contact=metadata.get("customer_contact"),
     )
 
-    answer = bridge.handle_customer_question(
-        customer_name=call.customer_name,
-        channel=call.channel,
-        question=call.question,
-        customer_contact=call.customer_contact,
+    from .profiling import maybe_profile
+
+    # The work runs in worker threads, which ``profiled`` profiles one at a time.
+    with maybe_profile("livekit.handle_job", profile_current_thread=False):
+        await _answer_call(call, ctx, bridge, resolution_wait_seconds, started, timings)
+
+    logger.info(
+        "Call from %s answered via %s: first reply %.1f ms (kb %.1f ms, escalation %s, saved %.1f ms)",
+        call.customer_name,
+        timings.path,
+        timings.time_to_first_reply_ms,
+        timings.knowledge_base_ms,
+        "n/a" if timings.escalation_ms is None else f"{timings.escalation_ms:.1f} ms",
+        timings.saved_ms,
     )
+    return timings
+
+
+async def _answer_call(
+    call: IncomingCall,
+    ctx: "agents.JobContext",
+    bridge: LiveKitAgentBridge,
+    resolution_wait_seconds: float,
+    started: float,
+    timings: CallTimings,
+) -> None:
+    from .profiling import profiled
+
+    answer = await asyncio.to_thread(profiled(bridge.answer_from_knowledge_base), call.question)
+    timings.knowledge_base_ms = _elapsed_ms(started)
 
     if answer:
         await ctx.send_message(answer)
+        timings.time_to_first_reply_ms = _elapsed_ms(started)
     else:
-        await ctx.send_message(
-            "Let me check with my supervisor and get back to you shortly."
+        timings.path = "escalated"
+        escalation_started = time.perf_counter()
+        escalation = asyncio.create_task(
+            asyncio.to_thread(
+                profiled(bridge.escalate),
+                customer_name=call.customer_name,
+                channel=call.channel,
+                question=call.question,
+                customer_contact=call.customer_contact,
+            )
         )
+        await ctx.send_message(HOLDING_MESSAGE)
+        timings.time_to_first_reply_ms = _elapsed_ms(started)
+        request = await escalation
+        timings.escalation_ms = _elapsed_ms(escalation_started)
+        # Interim (``unresolved``) answers are passed on and the call keeps
+        # waiting, for the rest of the window, for the final one.
+        deadline = time.perf_counter() + resolution_wait_seconds
+        interim = None
+        while (remaining := deadline - time.perf_counter()) > 0:
+            resolution = await bridge.wait_for_resolution(
+                request.id, timeout=remaining, seen=interim
+            )
+            if resolution is None:
+                break
+            if resolution != interim:
+                await ctx.send_message(resolution.answer)
+            if not resolution.unresolved:
+                timings.path = "resolved_in_call"
+                timings.resolution_ms = _elapsed_ms(started)
+                break
+            interim = resolution
 
 
 def run_worker() -> None:
-    if not cli or not agents:  # pragma: no cover
+    try:
+        from livekit.agents import cli
+    except ImportError as exc:  # pragma: no cover - optional dependency at runtime
         raise RuntimeError(
             "livekit.agents is not installed. Install optional deps to run the worker."
-        )
+        ) from exc
     cli.run_app(handle_job)
 
 
@@ -1,29 +1,55 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
 
+from .api.profiling import ProfilingMiddleware
 from .api.router import router
 from .config import get_settings
 from .repository import init_db
+from .services.coordination import MaintenanceScheduler
+
+
+class SettingsCORSMiddleware(CORSMiddleware):
+    """CORS configured from settings when Starlette first builds the middleware
+    stack, so importing this module does not load settings."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(
+            app,
+            allow_origins=get_settings().allowed_origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
 
-settings = get_settings()
 app = FastAPI(title="Human-in-the-loop API", version="0.1.0")
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allowed_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(SettingsCORSMiddleware)
 app.include_router(router)
 
 
 @app.on_event("startup")
 async def startup() -> None:
     init_db()
+    if get_settings().scheduler_enabled:
+        app.state.scheduler_task = asyncio.create_task(MaintenanceScheduler().run_forever())
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    task = getattr(app.state, "scheduler_task", None)
+    if task:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
 
 
 @app.get("/health")
 async def healthcheck() -> dict[str, str]:
-    return {"status": "ok", "app": settings.app_name}
+    return {"status": "ok", "app": get_settings().app_name}
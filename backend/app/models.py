@@ -6,13 +6,49 @@ from enum import Enum
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text
-from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    false,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 from .db import Base
 
 
+# JSONB on Postgres, JSON (text) on SQLite.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """Server-side default matching the naive UTC ``datetime.utcnow()`` values
+    written by the application, whatever the database session time zone."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw) -> str:
+    return "(now() AT TIME ZONE 'utc')"
+
+
 class RequestStatus(str, Enum):
     pending = "pending"
     resolved = "resolved"
@@ -29,18 +65,48 @@ class HelpRequestORM(Base):
     customer_contact: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
     channel: Mapped[str] = mapped_column(String(20))
     question: Mapped[str] = mapped_column(Text)
-    status: Mapped[str] = mapped_column(String(20), default=RequestStatus.pending.value)
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default=RequestStatus.pending.value,
+        server_default=RequestStatus.pending.value,
+    )
     answer: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    escalated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=utcnow()
+    )
+    escalated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=utcnow()
+    )
     resolved_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    history: Mapped[list] = mapped_column(SQLiteJSON, default=list)
+    history: Mapped[list] = mapped_column(JSONType, default=list, server_default="[]")
     follow_up_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    follow_up_reminder_sent: Mapped[bool] = mapped_column(Boolean, default=False)
+    follow_up_reminder_sent: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false()
+    )
+    # Identical questions escalated within a short window are grouped under the
+    # first ("primary") request, which alone is sent to the supervisor.
+    question_key: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    coalesced_into: Mapped[Optional[str]] = mapped_column(
+        ForeignKey("help_requests.id", ondelete="SET NULL"), nullable=True
+    )
 
     responses: Mapped[List["SupervisorResponseORM"]] = relationship(
-        back_populates="request", cascade="all, delete-orphan"
+        back_populates="request",
+        cascade="all, delete-orphan",
+        order_by="SupervisorResponseORM.created_at, SupervisorResponseORM.id",
+    )
+
+    __table_args__ = (
+        # Only rows still waiting for a reminder are indexed, which keeps the
+        # dispatcher's claim query cheap however many requests have been closed.
+        Index(
+            "ix_help_requests_follow_up_due",
+            "follow_up_at",
+            sqlite_where=text("follow_up_reminder_sent = 0"),
+            postgresql_where=text("follow_up_reminder_sent = false"),
+        ),
+        Index("ix_help_requests_question_key", "question_key", "status", "created_at"),
     )
 
 
@@ -51,9 +117,11 @@ class SupervisorResponseORM(Base):
     request_id: Mapped[str] = mapped_column(ForeignKey("help_requests.id"))
     answer: Mapped[str] = mapped_column(Text)
     topic: Mapped[str] = mapped_column(String(80), default="General")
-    unresolved: Mapped[bool] = mapped_column(default=False)
+    unresolved: Mapped[bool] = mapped_column(default=False, server_default=false())
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=utcnow()
+    )
 
     request: Mapped[HelpRequestORM] = relationship(back_populates="responses")
 
@@ -66,7 +134,95 @@ class KnowledgeBaseEntryORM(Base):
     topic: Mapped[str] = mapped_column(String(80))
     question: Mapped[str] = mapped_column(Text)
     answer: Mapped[str] = mapped_column(Text)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=utcnow()
+    )
+    # Normalised question used as the upsert key for bulk imports. Entries learnt
+    # from supervisor responses leave it empty so repeated answers are kept.
+    question_key: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, unique=True
+    )
+
+
+class LeaseORM(Base):
+    """Time-limited ownership of a singleton job shared by all processes."""
+
+    __tablename__ = "coordination_leases"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128))
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class ChangeVersionORM(Base):
+    """Monotonic counter bumped on writes that invalidate per-process caches."""
+
+    __tablename__ = "change_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=utcnow()
+    )
+
+
+class StatCounterORM(Base):
+    """Dashboard counter, e.g. (``status``, ``pending``) or (``topic``, ``Hours``)."""
+
+    __tablename__ = "stat_counters"
+
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)
+    key: Mapped[str] = mapped_column(String(120), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
+class LatencyBucketORM(Base):
+    """Histogram bucket of escalated_at -> resolved_at durations."""
+
+    __tablename__ = "resolution_latency_buckets"
+
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    total_seconds: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+    # Fastest and slowest duration seen; empty for buckets from older releases.
+    min_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    max_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+
+class StatEventORM(Base):
+    """Pending counter delta or latency sample, not yet folded into the totals.
+
+    Request transactions only insert these rows, so concurrent writers never
+    contend for the shared ``stat_counters`` rows.
+    """
+
+    __tablename__ = "stat_events"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    dimension: Mapped[str] = mapped_column(String(20))
+    key: Mapped[str] = mapped_column(String(120))
+    delta: Mapped[int] = mapped_column(Integer, default=1)
+    seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+
+class IdempotencyKeyORM(Base):
+    """Stored outcome of a POST sent with an ``Idempotency-Key`` header.
+
+    ``status_code`` stays empty until the request's own transaction records the
+    response, which commits together with the writes it describes.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    scope: Mapped[str] = mapped_column(String(200), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, server_default=utcnow()
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
 
 
 # --------- Pydantic Schemas (shared) ---------
@@ -77,6 +233,19 @@ class HistoryEntry(BaseModel):
     message: str
 
 
+class SupervisorResponse(BaseModel):
+    id: int
+    request_id: str
+    answer: str
+    topic: str
+    unresolved: bool
+    notes: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class HelpRequest(BaseModel):
     id: str
     customer_name: str
@@ -92,19 +261,8 @@ class HelpRequest(BaseModel):
     history: List[HistoryEntry] = Field(default_factory=list)
     follow_up_at: Optional[datetime] = None
     follow_up_reminder_sent: bool = False
-
-    class Config:
-        from_attributes = True
-
-
-class SupervisorResponse(BaseModel):
-    id: int
-    request_id: str
-    answer: str
-    topic: str
-    unresolved: bool
-    notes: Optional[str]
-    created_at: datetime
+    coalesced_into: Optional[str] = None
+    responses: List[SupervisorResponse] = Field(default_factory=list)
 
     class Config:
         from_attributes = True
@@ -122,6 +280,10 @@ class KnowledgeBaseEntry(BaseModel):
         from_attributes = True
 
 
+def normalize_question(question: str) -> str:
+    return " ".join((question or "").lower().split())
+
+
 def append_history(entry_list: list, message: str) -> list:
     entry_list = list(entry_list or [])
     entry_list.append({"timestamp": datetime.utcnow().isoformat(), "message": message})
@@ -0,0 +1,209 @@
+"""Opt-in profiling: cProfile traces plus per-statement SQL timings.
+
+``profile_block`` wraps any unit of work (an HTTP request, a LiveKit job) and
+records a summary in ``profile_store``. SQL statements are timed through
+SQLAlchemy engine events and attributed to the active block through a context
+variable, so they are captured even when the work runs in a worker thread.
+The FastAPI middleware and route class live in ``app.api.profiling``.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import logging
+import pstats
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+
+@dataclass
+class QueryTiming:
+    statement: str
+    duration_ms: float
+
+
+@dataclass
+class ProfileSession:
+    label: str
+    profiler: Optional[cProfile.Profile] = field(default_factory=cProfile.Profile)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    queries: list[QueryTiming] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    total_ms: float = 0.0
+
+    def record_query(self, statement: str, duration_ms: float) -> None:
+        self.queries.append(QueryTiming(statement=statement, duration_ms=duration_ms))
+
+    @property
+    def sql_ms(self) -> float:
+        return sum(query.duration_ms for query in self.queries)
+
+    def summary(self, *, top: int = 15) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "total_ms": round(self.total_ms, 3),
+            "sql": {
+                "count": len(self.queries),
+                "total_ms": round(self.sql_ms, 3),
+                "statements": [
+                    {"statement": query.statement, "duration_ms": round(query.duration_ms, 3)}
+                    for query in self.queries
+                ],
+            },
+            "top_functions": self._top_functions(top),
+        }
+
+    def _top_functions(self, top: int) -> list[dict[str, Any]]:
+        if self.profiler is None:
+            return []
+        try:
+            stats = pstats.Stats(self.profiler)
+        except TypeError:  # nothing was profiled
+            return []
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "own_ms": round(own * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, own, cumulative, _) in rows[:top]
+        ]
+
+
+class ProfileStore:
+    """Bounded in-memory history of recent profile summaries."""
+
+    def __init__(self, max_entries: int = 50) -> None:
+        self._entries: deque[dict[str, Any]] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def add(self, summary: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.appendleft(summary)
+
+    def list(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, profile_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return next((entry for entry in self._entries if entry["id"] == profile_id), None)
+
+
+profile_store = ProfileStore()
+
+
+def install_sql_hooks() -> None:
+    """Time every cursor execution on every engine while a profile is active."""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _hooks_installed = True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    session = _current.get()
+    starts = conn.info.get("profile_query_start")
+    if session is None or not starts:
+        return
+    session.record_query(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+
+@contextmanager
+def profile_block(label: str, *, profile_current_thread: bool = True) -> Iterator[ProfileSession]:
+    """Profile the enclosed work and store its summary.
+
+    With ``profile_current_thread=False`` the cProfile collector is left for
+    ``profiled`` wrappers to enable in whichever thread runs the work.
+    """
+    install_sql_hooks()
+    session = ProfileSession(label=label)
+    token = _current.set(session)
+    if profile_current_thread:
+        session.profiler.enable()
+    try:
+        yield session
+    finally:
+        if profile_current_thread:
+            session.profiler.disable()
+        _current.reset(token)
+        session.total_ms = (time.perf_counter() - session.started) * 1000
+        summary = session.summary(top=get_settings().profiling_top_functions)
+        profile_store.add(summary)
+        logger.info(
+            "Profile %s [%s]: %.1f ms total, %d SQL statements in %.1f ms",
+            session.id,
+            label,
+            session.total_ms,
+            len(session.queries),
+            session.sql_ms,
+        )
+
+
+def maybe_profile(
+    label: str, *, profile_current_thread: bool = True
+) -> AbstractContextManager[Optional[ProfileSession]]:
+    """``profile_block`` when ``PROFILING_ENABLED`` is set, otherwise a no-op.
+
+    Nested inside an already profiled request it does nothing, so the work is
+    reported once, as part of the outer profile.
+    """
+    if not get_settings().profiling_enabled or _current.get() is not None:
+        return nullcontext()
+    return profile_block(label, profile_current_thread=profile_current_thread)
+
+
+def profiled(func: Callable) -> Callable:
+    """Run ``func`` under the active profile's cProfile collector, if any."""
+    if asyncio.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            session = _current.get()
+            if session is None or session.profiler is None:
+                return await func(*args, **kwargs)
+            session.profiler.enable()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                session.profiler.disable()
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _current.get()
+        if session is None or session.profiler is None:
+            return func(*args, **kwargs)
+        return session.profiler.runcall(func, *args, **kwargs)
+
+    return wrapper
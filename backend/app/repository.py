@@ -1,23 +1,85 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, false, func, insert, inspect, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only, selectinload
 
-from .db import Base, engine
+from .db import Base, get_engine
 from .models import (
+    ChangeVersionORM,
     HelpRequestORM,
+    IdempotencyKeyORM,
     KnowledgeBaseEntryORM,
+    LatencyBucketORM,
+    LeaseORM,
     RequestStatus,
+    StatCounterORM,
+    StatEventORM,
     SupervisorResponseORM,
     append_history,
 )
 
 
 def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
+    engine = get_engine()
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            # Only takes effect for a new database file; lets the archival job
+            # hand freed pages back with ``PRAGMA incremental_vacuum``.
+            conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        Base.metadata.create_all(bind=conn)
+    _add_missing_columns(engine)
+
+
+def incremental_vacuum(session: Session) -> bool:
+    """Release free pages on SQLite databases created with incremental auto-vacuum."""
+    if session.get_bind().dialect.name != "sqlite":
+        return False
+    if session.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+        return False
+    session.execute(text("PRAGMA incremental_vacuum"))
+    return True
+
+
+def _add_missing_columns(bind: Engine) -> None:
+    """Bring tables created by older releases up to date with the models.
+
+    ``create_all`` only creates missing tables, so new nullable columns and
+    their indexes are added here for existing databases.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(
+                    text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+                )
+                if column.unique:
+                    conn.execute(
+                        text(
+                            f'CREATE UNIQUE INDEX "uq_{table.name}_{column.name}" '
+                            f'ON "{table.name}" ("{column.name}")'
+                        )
+                    )
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _dialect_insert(session: Session):
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
 
 
 class HelpRequestRepository:
@@ -25,13 +87,36 @@ class HelpRequestRepository:
         self.session = session
 
     def list(self, status: Optional[RequestStatus] = None) -> Iterable[HelpRequestORM]:
-        stmt = select(HelpRequestORM).order_by(HelpRequestORM.created_at.desc())
+        stmt = (
+            select(HelpRequestORM)
+            .options(selectinload(HelpRequestORM.responses))
+            .order_by(HelpRequestORM.created_at.desc())
+        )
         if status:
             stmt = stmt.where(HelpRequestORM.status == status.value)
         return self.session.scalars(stmt).all()
 
+    def iter_all(
+        self, status: Optional[RequestStatus] = None, *, batch_size: int = 500
+    ) -> Iterator[HelpRequestORM]:
+        """Stream rows in batches instead of materialising the whole table.
+
+        Responses are fetched with one extra query per batch.
+        """
+        stmt = (
+            select(HelpRequestORM)
+            .options(selectinload(HelpRequestORM.responses))
+            .order_by(HelpRequestORM.created_at.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        if status:
+            stmt = stmt.where(HelpRequestORM.status == status.value)
+        yield from self.session.scalars(stmt)
+
     def get(self, request_id: str) -> Optional[HelpRequestORM]:
-        return self.session.get(HelpRequestORM, request_id)
+        return self.session.get(
+            HelpRequestORM, request_id, options=[selectinload(HelpRequestORM.responses)]
+        )
 
     def create(
         self,
@@ -41,6 +126,8 @@ class HelpRequestRepository:
         question: str,
         customer_contact: Optional[str] = None,
         history_message: Optional[str] = None,
+        question_key: Optional[str] = None,
+        coalesced_into: Optional[str] = None,
     ) -> HelpRequestORM:
         history = []
         if history_message:
@@ -51,11 +138,69 @@ class HelpRequestRepository:
             customer_contact=customer_contact,
             question=question,
             history=history,
+            question_key=question_key,
+            coalesced_into=coalesced_into,
+            responses=[],
         )
         self.session.add(request)
         self.session.flush()
         return request
 
+    def lock_question_key(self, question_key: str) -> None:
+        """Serialize coalescing decisions for ``question_key`` until commit.
+
+        Postgres takes a transaction-scoped advisory lock on the key, so only
+        identical questions wait for each other. SQLite has a single writer:
+        a no-op UPDATE starts the write transaction now, before the lookup,
+        rather than at the INSERT that follows it.
+        """
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            self.session.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext('help_requests'), hashtext(:key))"),
+                {"key": question_key},
+            )
+        elif dialect == "sqlite":
+            self.session.execute(
+                update(HelpRequestORM)
+                .where(HelpRequestORM.question_key == question_key, false())
+                .values(question_key=question_key)
+            )
+
+    def find_coalescing_primary(
+        self, question_key: str, *, since: datetime
+    ) -> Optional[HelpRequestORM]:
+        """Oldest pending, ungrouped request with the same question since ``since``."""
+        stmt = (
+            select(HelpRequestORM)
+            .where(
+                HelpRequestORM.question_key == question_key,
+                HelpRequestORM.status == RequestStatus.pending.value,
+                HelpRequestORM.coalesced_into.is_(None),
+                HelpRequestORM.created_at >= since,
+            )
+            .order_by(HelpRequestORM.created_at.asc())
+            .limit(1)
+        )
+        return self.session.scalars(stmt).first()
+
+    def list_coalesced(self, primary_id: str) -> Iterable[HelpRequestORM]:
+        """Requests grouped under ``primary_id`` that still await a final answer.
+
+        Followers left ``unresolved`` by an interim answer or a timeout are
+        included, so the eventual resolution reaches them too.
+        """
+        stmt = (
+            select(HelpRequestORM)
+            .options(selectinload(HelpRequestORM.responses))
+            .where(
+                HelpRequestORM.coalesced_into == primary_id,
+                HelpRequestORM.status != RequestStatus.resolved.value,
+            )
+            .order_by(HelpRequestORM.created_at.asc())
+        )
+        return self.session.scalars(stmt).all()
+
     def add_history(self, request: HelpRequestORM, message: str) -> None:
         request.history = append_history(request.history, message)
         self.session.add(request)
@@ -76,20 +221,26 @@ class HelpRequestRepository:
         notes: Optional[str],
     ) -> SupervisorResponseORM:
         response = SupervisorResponseORM(
-            request_id=request.id,
             answer=answer,
             topic=topic,
             unresolved=unresolved,
             notes=notes,
+            created_at=datetime.utcnow(),
         )
+        newly_resolved = not unresolved and request.status != RequestStatus.resolved.value
         request.status = (
             RequestStatus.unresolved.value if unresolved else RequestStatus.resolved.value
         )
         request.answer = answer
         request.notes = notes
-        request.resolved_at = request.resolved_at or response.created_at
+        if newly_resolved:
+            # A timeout or interim answer may have set it already; time-to-resolve
+            # is measured to the answer that actually resolves the request.
+            request.resolved_at = response.created_at
+        else:
+            request.resolved_at = request.resolved_at or response.created_at
         self.add_history(request, f"Supervisor responded: {answer}")
-        self.session.add(response)
+        request.responses.append(response)
         self.session.flush()
         return response
 
@@ -106,22 +257,103 @@ class HelpRequestRepository:
         request.follow_up_reminder_sent = False
         self.session.add(request)
 
-    def list_due_followups(self, current_time: datetime) -> Iterable[HelpRequestORM]:
+    def list_overdue_pending(self, cutoff: datetime) -> Iterable[HelpRequestORM]:
         stmt = (
             select(HelpRequestORM)
+            .options(selectinload(HelpRequestORM.responses))
+            .where(
+                HelpRequestORM.status == RequestStatus.pending.value,
+                HelpRequestORM.escalated_at <= cutoff,
+            )
+            .order_by(HelpRequestORM.escalated_at.asc())
+        )
+        return self.session.scalars(stmt).all()
+
+    def list_archivable(self, cutoff: datetime, *, limit: int) -> list[HelpRequestORM]:
+        stmt = (
+            select(HelpRequestORM)
+            .options(selectinload(HelpRequestORM.responses))
+            .where(
+                HelpRequestORM.status.in_(
+                    [RequestStatus.resolved.value, RequestStatus.unresolved.value]
+                ),
+                func.coalesce(HelpRequestORM.resolved_at, HelpRequestORM.created_at)
+                < cutoff,
+            )
+            .order_by(HelpRequestORM.created_at.asc())
+            .limit(limit)
+        )
+        return list(self.session.scalars(stmt))
+
+    def delete_many(self, request_ids: list[str]) -> None:
+        # Followers of an archived primary may still be open; detach them first
+        # (also covers tables created before ``coalesced_into`` had ON DELETE).
+        self.session.execute(
+            update(HelpRequestORM)
+            .where(
+                HelpRequestORM.coalesced_into.in_(request_ids),
+                HelpRequestORM.id.not_in(request_ids),
+            )
+            .values(coalesced_into=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.execute(
+            delete(SupervisorResponseORM).where(
+                SupervisorResponseORM.request_id.in_(request_ids)
+            )
+        )
+        self.session.execute(
+            delete(HelpRequestORM).where(HelpRequestORM.id.in_(request_ids))
+        )
+
+    def claim_due_followups(self, current_time: datetime, *, limit: int) -> list[Row]:
+        """Atomically flag up to ``limit`` due reminders as sent.
+
+        Returns ``(id, customer_name, channel, follow_up_at)`` rows only, so the
+        question/answer/history text of claimed requests is never loaded.
+
+        The single conditional UPDATE ... RETURNING means concurrent dispatchers
+        never claim the same row; on Postgres ``SKIP LOCKED`` lets them work on
+        disjoint batches instead of queueing behind each other.
+        """
+        due_ids = (
+            select(HelpRequestORM.id)
             .where(
                 HelpRequestORM.status == RequestStatus.unresolved.value,
-                HelpRequestORM.follow_up_at.is_not(None),
-                HelpRequestORM.follow_up_reminder_sent.is_(False),
+                HelpRequestORM.follow_up_reminder_sent == False,  # noqa: E712 - matches partial index
                 HelpRequestORM.follow_up_at <= current_time,
             )
             .order_by(HelpRequestORM.follow_up_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
         )
-        return self.session.scalars(stmt).all()
+        stmt = (
+            update(HelpRequestORM)
+            .where(
+                HelpRequestORM.id.in_(due_ids),
+                HelpRequestORM.follow_up_reminder_sent == False,  # noqa: E712
+            )
+            .values(follow_up_reminder_sent=True)
+            .returning(
+                HelpRequestORM.id,
+                HelpRequestORM.customer_name,
+                HelpRequestORM.channel,
+                HelpRequestORM.follow_up_at,
+            )
+        )
+        return list(self.session.execute(stmt))
 
-    def mark_follow_up_reminder_sent(self, request: HelpRequestORM) -> None:
-        request.follow_up_reminder_sent = True
-        self.session.add(request)
+    def add_history_many(self, request_ids: list[str], message: str) -> None:
+        if not request_ids:
+            return
+        stmt = (
+            select(HelpRequestORM)
+            .options(load_only(HelpRequestORM.id, HelpRequestORM.history))
+            .where(HelpRequestORM.id.in_(request_ids))
+        )
+        for request in self.session.scalars(stmt):
+            self.add_history(request, message)
 
 
 class KnowledgeBaseRepository:
@@ -134,6 +366,30 @@ class KnowledgeBaseRepository:
         )
         return self.session.scalars(stmt).all()
 
+    def iter_all(self, *, batch_size: int = 500) -> Iterator[KnowledgeBaseEntryORM]:
+        stmt = (
+            select(KnowledgeBaseEntryORM)
+            .order_by(KnowledgeBaseEntryORM.updated_at.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.scalars(stmt)
+
+    def iter_snapshot_rows(self, *, batch_size: int = 1000) -> Iterator[Row]:
+        """``(id, source_request_id, topic, question, answer, updated_at)`` tuples."""
+        stmt = (
+            select(
+                KnowledgeBaseEntryORM.id,
+                KnowledgeBaseEntryORM.source_request_id,
+                KnowledgeBaseEntryORM.topic,
+                KnowledgeBaseEntryORM.question,
+                KnowledgeBaseEntryORM.answer,
+                KnowledgeBaseEntryORM.updated_at,
+            )
+            .order_by(KnowledgeBaseEntryORM.updated_at.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(stmt)
+
     def create_from_response(
         self,
         *,
@@ -149,3 +405,278 @@ class KnowledgeBaseRepository:
         self.session.add(entry)
         self.session.flush()
         return entry
+
+    def upsert_many(self, rows: list[dict]) -> int:
+        """Insert or update entries keyed by ``question_key`` in one executemany."""
+        if not rows:
+            return 0
+        # Postgres rejects a batch that touches the same conflict key twice.
+        deduped = list({row["question_key"]: row for row in rows}.values())
+        table = KnowledgeBaseEntryORM.__table__
+        stmt = _dialect_insert(self.session)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.question_key],
+            set_={
+                "topic": stmt.excluded.topic,
+                "question": stmt.excluded.question,
+                "answer": stmt.excluded.answer,
+                "source_request_id": stmt.excluded.source_request_id,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self.session.execute(stmt, deduped)
+        return len(deduped)
+
+
+class CoordinationRepository:
+    """Leases and change counters that let several processes share one database."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def try_acquire_lease(
+        self, name: str, holder: str, *, expires_at: datetime, now: datetime
+    ) -> bool:
+        insert = _dialect_insert(self.session)
+        self.session.execute(
+            insert(LeaseORM.__table__)
+            .values(name=name, holder=holder, expires_at=now)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        result = self.session.execute(
+            update(LeaseORM.__table__)
+            .where(
+                LeaseORM.name == name,
+                or_(LeaseORM.holder == holder, LeaseORM.expires_at <= now),
+            )
+            .values(holder=holder, expires_at=expires_at)
+        )
+        return result.rowcount == 1
+
+    def release_lease(self, name: str, holder: str) -> None:
+        self.session.execute(
+            delete(LeaseORM.__table__).where(
+                LeaseORM.name == name, LeaseORM.holder == holder
+            )
+        )
+
+    def bump_version(self, name: str) -> None:
+        insert = _dialect_insert(self.session)
+        stmt = insert(ChangeVersionORM.__table__).values(
+            name=name, version=1, updated_at=datetime.utcnow()
+        )
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={
+                    "version": ChangeVersionORM.__table__.c.version + 1,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
+    def current_version(self, name: str) -> int:
+        version = self.session.scalar(
+            select(ChangeVersionORM.version).where(ChangeVersionORM.name == name)
+        )
+        return version or 0
+
+
+class StatsRepository:
+    """Counters and latency histogram behind the dashboard stats endpoint.
+
+    Request transactions append ``stat_events`` rows; ``take_events`` later
+    removes them for folding into the totals. Totals are updated with relative
+    upserts (``count = count + delta``) in ``(dimension, key)`` order, so
+    concurrent roll-ups neither overwrite each other nor lock rows in
+    opposite orders.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def add_events(self, events: list[dict]) -> None:
+        if events:
+            self.session.execute(insert(StatEventORM), events)
+
+    def take_events(self, *, limit: int) -> list[Row]:
+        """Delete up to ``limit`` of the oldest events and return them.
+
+        A concurrent caller blocks on the same rows and then skips them, so
+        each event is returned to exactly one roll-up.
+        """
+        oldest = select(StatEventORM.id).order_by(StatEventORM.id).limit(limit)
+        stmt = (
+            delete(StatEventORM)
+            .where(StatEventORM.id.in_(oldest.scalar_subquery()))
+            .returning(
+                StatEventORM.dimension,
+                StatEventORM.key,
+                StatEventORM.delta,
+                StatEventORM.seconds,
+            )
+        )
+        return list(self.session.execute(stmt))
+
+    def bump(self, deltas: dict[tuple[str, str], int]) -> None:
+        rows = [
+            {"dimension": dimension, "key": key, "count": delta}
+            for (dimension, key), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        table = StatCounterORM.__table__
+        stmt = _dialect_insert(self.session)(table)
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.dimension, table.c.key],
+                set_={"count": table.c.count + stmt.excluded.count},
+            ),
+            rows,
+        )
+
+    def record_latency(
+        self,
+        bucket: int,
+        *,
+        count: int,
+        total_seconds: float,
+        min_seconds: float,
+        max_seconds: float,
+    ) -> None:
+        table = LatencyBucketORM.__table__
+        stmt = _dialect_insert(self.session)(table).values(
+            bucket=bucket,
+            count=count,
+            total_seconds=total_seconds,
+            min_seconds=min_seconds,
+            max_seconds=max_seconds,
+        )
+        excluded = stmt.excluded
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.bucket],
+                set_={
+                    "count": table.c.count + excluded.count,
+                    "total_seconds": table.c.total_seconds + excluded.total_seconds,
+                    "min_seconds": case(
+                        (table.c.min_seconds <= excluded.min_seconds, table.c.min_seconds),
+                        else_=excluded.min_seconds,
+                    ),
+                    "max_seconds": case(
+                        (table.c.max_seconds >= excluded.max_seconds, table.c.max_seconds),
+                        else_=excluded.max_seconds,
+                    ),
+                },
+            )
+        )
+
+    def counters(self) -> list[Row]:
+        """``(dimension, key, count)`` rows with a non-zero count."""
+        stmt = select(
+            StatCounterORM.dimension, StatCounterORM.key, StatCounterORM.count
+        ).where(StatCounterORM.count != 0)
+        return list(self.session.execute(stmt))
+
+    def latency_buckets(self) -> list[Row]:
+        """``(bucket, count, total_seconds, min_seconds, max_seconds)`` rows in bucket order."""
+        stmt = select(
+            LatencyBucketORM.bucket,
+            LatencyBucketORM.count,
+            LatencyBucketORM.total_seconds,
+            LatencyBucketORM.min_seconds,
+            LatencyBucketORM.max_seconds,
+        ).order_by(LatencyBucketORM.bucket)
+        return list(self.session.execute(stmt))
+
+    def clear(self) -> None:
+        self.session.execute(delete(StatEventORM))
+        self.session.execute(delete(StatCounterORM))
+        self.session.execute(delete(LatencyBucketORM))
+
+    def count_requests_by(self, column) -> list[Row]:
+        stmt = select(column, func.count()).group_by(column)
+        return list(self.session.execute(stmt))
+
+    def count_responses_by_topic(self) -> list[Row]:
+        stmt = select(SupervisorResponseORM.topic, func.count()).group_by(
+            SupervisorResponseORM.topic
+        )
+        return list(self.session.execute(stmt))
+
+    def iter_resolution_times(self, *, batch_size: int = 1000) -> Iterator[Row]:
+        """``(escalated_at, resolved_at)`` of resolved requests."""
+        stmt = (
+            select(HelpRequestORM.escalated_at, HelpRequestORM.resolved_at)
+            .where(
+                HelpRequestORM.status == RequestStatus.resolved.value,
+                HelpRequestORM.resolved_at.is_not(None),
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(stmt)
+
+
+class IdempotencyRepository:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def claim(
+        self,
+        scope: str,
+        key: str,
+        request_hash: str,
+        *,
+        now: datetime,
+        expires_at: datetime,
+    ) -> bool:
+        """Reserve ``key`` for this request; False if a live record already holds it.
+
+        Concurrent claims of the same key block on the row until the first
+        transaction ends, then see its outcome instead of running again.
+        """
+        table = IdempotencyKeyORM.__table__
+        insert = _dialect_insert(self.session)
+        result = self.session.execute(
+            insert(table)
+            .values(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                created_at=now,
+                expires_at=expires_at,
+            )
+            .on_conflict_do_nothing(index_elements=[table.c.scope, table.c.key])
+        )
+        if result.rowcount == 1:
+            return True
+        # An expired record is taken over rather than replayed.
+        result = self.session.execute(
+            update(table)
+            .where(table.c.scope == scope, table.c.key == key, table.c.expires_at <= now)
+            .values(
+                request_hash=request_hash,
+                status_code=None,
+                body=None,
+                created_at=now,
+                expires_at=expires_at,
+            )
+        )
+        return result.rowcount == 1
+
+    def get(self, scope: str, key: str) -> Optional[IdempotencyKeyORM]:
+        return self.session.get(IdempotencyKeyORM, (scope, key))
+
+    def complete(self, scope: str, key: str, *, status_code: int, body: str) -> None:
+        self.session.execute(
+            update(IdempotencyKeyORM.__table__)
+            .where(IdempotencyKeyORM.scope == scope, IdempotencyKeyORM.key == key)
+            .values(status_code=status_code, body=body)
+        )
+
+    def delete_expired(self, now: datetime) -> int:
+        result = self.session.execute(
+            delete(IdempotencyKeyORM.__table__).where(IdempotencyKeyORM.expires_at <= now)
+        )
+        return result.rowcount
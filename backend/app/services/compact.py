@@ -0,0 +1,159 @@
+"""Compact in-memory records for the hot KB snapshot and reminder batches.
+
+Pydantic models and ORM instances carry a ``__dict__`` plus validation or
+instance state per row. These containers store plain columns instead: ids and
+timestamps in ``array`` buffers, repeated strings (topics, channels, sources)
+interned, and one ``__slots__`` record materialised only when asked for. Convert
+to the Pydantic models with ``to_model`` at the API boundary.
+"""
+from __future__ import annotations
+
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+from ..models import KnowledgeBaseEntry
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def pack_timestamp(value: datetime) -> float:
+    return (value - _EPOCH).total_seconds()
+
+
+def unpack_timestamp(value: float) -> datetime:
+    return _EPOCH + timedelta(seconds=value)
+
+
+class KnowledgeBaseRecord:
+    __slots__ = ("id", "source_request_id", "topic", "question", "answer", "updated_at")
+
+    def __init__(
+        self,
+        id: int,
+        source_request_id: str,
+        topic: str,
+        question: str,
+        answer: str,
+        updated_at: datetime,
+    ) -> None:
+        self.id = id
+        self.source_request_id = source_request_id
+        self.topic = topic
+        self.question = question
+        self.answer = answer
+        self.updated_at = updated_at
+
+    def to_model(self) -> KnowledgeBaseEntry:
+        return KnowledgeBaseEntry.model_validate(self, from_attributes=True)
+
+
+class KnowledgeBaseSnapshot:
+    """Read-only, column-oriented copy of the knowledge base."""
+
+    __slots__ = ("_ids", "_updated_at", "_sources", "_topics", "_questions", "_answers")
+
+    def __init__(self) -> None:
+        self._ids = array("q")
+        self._updated_at = array("d")
+        self._sources: list[str] = []
+        self._topics: list[str] = []
+        self._questions: list[str] = []
+        self._answers: list[str] = []
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[tuple[int, str, str, str, str, datetime]]
+    ) -> "KnowledgeBaseSnapshot":
+        """Build from ``(id, source_request_id, topic, question, answer, updated_at)``."""
+        snapshot = cls()
+        for entry_id, source, topic, question, answer, updated_at in rows:
+            snapshot._ids.append(entry_id)
+            snapshot._updated_at.append(pack_timestamp(updated_at))
+            snapshot._sources.append(sys.intern(source))
+            snapshot._topics.append(sys.intern(topic))
+            snapshot._questions.append(question)
+            snapshot._answers.append(answer)
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: int) -> KnowledgeBaseRecord:
+        return KnowledgeBaseRecord(
+            self._ids[index],
+            self._sources[index],
+            self._topics[index],
+            self._questions[index],
+            self._answers[index],
+            unpack_timestamp(self._updated_at[index]),
+        )
+
+    def __iter__(self) -> Iterator[KnowledgeBaseRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def match(self, question: str) -> Optional[str]:
+        """Answer of the first entry whose question contains, or is contained in, ``question``."""
+        q_lower = question.lower()
+        for index, candidate in enumerate(self._questions):
+            candidate = candidate.lower()
+            if candidate in q_lower or q_lower in candidate:
+                return self._answers[index]
+        return None
+
+
+class DueReminder:
+    __slots__ = ("request_id", "customer_name", "channel", "follow_up_at")
+
+    def __init__(
+        self, request_id: str, customer_name: str, channel: str, follow_up_at: datetime
+    ) -> None:
+        self.request_id = request_id
+        self.customer_name = customer_name
+        self.channel = channel
+        self.follow_up_at = follow_up_at
+
+
+class DueReminderQueue:
+    """Claimed reminders awaiting delivery, stored as parallel columns."""
+
+    __slots__ = ("_ids", "_names", "_channels", "_follow_up_at")
+
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._names: list[str] = []
+        self._channels: list[str] = []
+        self._follow_up_at = array("d")
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[tuple[str, str, str, datetime]]
+    ) -> "DueReminderQueue":
+        """Build from ``(id, customer_name, channel, follow_up_at)``, earliest first."""
+        queue = cls()
+        for request_id, customer_name, channel, follow_up_at in sorted(
+            rows, key=lambda row: row[3]
+        ):
+            queue._ids.append(request_id)
+            queue._names.append(customer_name)
+            queue._channels.append(sys.intern(channel))
+            queue._follow_up_at.append(pack_timestamp(follow_up_at))
+        return queue
+
+    @property
+    def request_ids(self) -> list[str]:
+        return list(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[DueReminder]:
+        for index in range(len(self._ids)):
+            yield DueReminder(
+                self._ids[index],
+                self._names[index],
+                self._channels[index],
+                unpack_timestamp(self._follow_up_at[index]),
+            )
@@ -0,0 +1,141 @@
+"""Coordination between API and LiveKit worker processes sharing one database.
+
+* ``MaintenanceScheduler`` runs follow-up dispatch, the timeout sweep and the
+  purge of expired idempotency keys under a DB-backed lease, so only one process
+  does the work at a time and another takes over when the holder stops renewing.
+* ``ChangeWatcher`` polls a ``change_versions`` row (one primary-key lookup,
+  throttled) and fires local cache invalidation when another process changed it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import AbstractContextManager
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..repository import CoordinationRepository
+from .help_requests import HelpRequestService
+from .idempotency import IdempotencyService
+from .knowledge_base import KNOWLEDGE_BASE_CHANNEL, notify_knowledge_base_changed
+from .stats import StatsService
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_LEASE = "maintenance"
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+
+def process_identity() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class ChangeWatcher:
+    def __init__(
+        self, name: str, on_change: Callable[[], None], *, interval_seconds: float
+    ) -> None:
+        self.name = name
+        self.on_change = on_change
+        self.interval_seconds = interval_seconds
+        self._seen: Optional[int] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def poll(self, session: Session) -> bool:
+        """Return True (after firing ``on_change``) if the version moved."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_check:
+                return False
+            self._next_check = now + self.interval_seconds
+            version = CoordinationRepository(session).current_version(self.name)
+            previous, self._seen = self._seen, version
+        if previous is None or previous == version:
+            return False
+        self.on_change()
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_knowledge_base_watcher() -> ChangeWatcher:
+    return ChangeWatcher(
+        KNOWLEDGE_BASE_CHANNEL,
+        notify_knowledge_base_changed,
+        interval_seconds=get_settings().change_poll_interval_seconds,
+    )
+
+
+class MaintenanceScheduler:
+    def __init__(
+        self,
+        session_factory: Optional[SessionFactory] = None,
+        *,
+        holder: Optional[str] = None,
+    ) -> None:
+        if session_factory is None:
+            from ..db import db_session
+
+            session_factory = db_session
+        self.settings = get_settings()
+        self.session_factory = session_factory
+        self.holder = holder or process_identity()
+
+    def run_once(self, *, now: Optional[datetime] = None) -> Optional[dict[str, int]]:
+        """Run one maintenance pass if this process holds the lease."""
+        current_time = now or datetime.utcnow()
+        # The lease is committed on its own so other processes see it before
+        # the (possibly slow) work starts.
+        with self.session_factory() as session:
+            acquired = CoordinationRepository(session).try_acquire_lease(
+                MAINTENANCE_LEASE,
+                self.holder,
+                expires_at=current_time
+                + timedelta(seconds=self.settings.scheduler_lease_seconds),
+                now=current_time,
+            )
+        if not acquired:
+            return None
+        with self.session_factory() as session:
+            service = HelpRequestService(session)
+            timed_out = service.sweep_timeouts(now=current_time)
+        with self.session_factory() as session:
+            reminders = HelpRequestService(session).send_due_follow_up_reminders(
+                now=current_time
+            )
+        with self.session_factory() as session:
+            evicted = IdempotencyService(session).purge_expired(now=current_time)
+        with self.session_factory() as session:
+            rolled_up = StatsService(session).rollup()
+        return {
+            "timed_out": timed_out,
+            "reminders_sent": reminders,
+            "idempotency_keys_evicted": evicted,
+            "stat_events_rolled_up": rolled_up,
+        }
+
+    def release(self) -> None:
+        with self.session_factory() as session:
+            CoordinationRepository(session).release_lease(MAINTENANCE_LEASE, self.holder)
+
+    async def run_forever(self) -> None:
+        try:
+            while True:
+                try:
+                    result = await asyncio.to_thread(self.run_once)
+                    if result and any(result.values()):
+                        logger.info("Maintenance pass by %s: %s", self.holder, result)
+                except Exception:  # pragma: no cover - keep the loop alive
+                    logger.exception("Maintenance pass failed")
+                await asyncio.sleep(self.settings.scheduler_interval_seconds)
+        finally:
+            await asyncio.to_thread(self.release)
@@ -0,0 +1,53 @@
+"""Row-at-a-time serializers used by the streaming export endpoints."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Sequence
+
+from pydantic import BaseModel
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def ndjson_lines(items: Iterable[BaseModel]) -> Iterator[str]:
+    for item in items:
+        yield item.model_dump_json() + "\n"
+
+
+def csv_lines(items: Iterable[BaseModel], fields: Sequence[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def _flush() -> str:
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value
+
+    writer.writerow(fields)
+    yield _flush()
+    for item in items:
+        data = item.model_dump(mode="json", include=set(fields))
+        writer.writerow([_csv_cell(data.get(field)) for field in fields])
+        yield _flush()
+
+
+def serialize(items: Iterable[BaseModel], *, fmt: str, fields: Sequence[str]) -> Iterator[str]:
+    if fmt == "ndjson":
+        return ndjson_lines(items)
+    if fmt == "csv":
+        return csv_lines(items, fields)
+    raise ValueError(f"Unsupported export format '{fmt}'")
+
+
+def _csv_cell(value: object) -> object:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
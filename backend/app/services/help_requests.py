@@ -1,14 +1,33 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from ..cache import (
+    HELP_REQUEST_ROUTE,
+    KNOWLEDGE_BASE_ROUTE,
+    ResponseCache,
+    get_response_cache,
+)
 from ..config import get_settings
-from ..models import HelpRequest, KnowledgeBaseEntry, RequestStatus
+from ..models import (
+    HelpRequest,
+    HelpRequestORM,
+    KnowledgeBaseEntry,
+    RequestStatus,
+    SupervisorResponseORM,
+    normalize_question,
+)
 from ..repository import HelpRequestRepository, KnowledgeBaseRepository
+from .compact import DueReminderQueue
+from .exports import serialize
+from .knowledge_base import mark_knowledge_base_changed
 from .notifications import NotificationPayload, NotificationSink, console_notifier
+from .resolutions import Resolution, ResolutionBroker, resolution_broker
+from .stats import StatsService
 
 
 class HelpRequestService:
@@ -16,11 +35,17 @@ class HelpRequestService:
         self,
         session: Session,
         notifier: NotificationSink = console_notifier,
+        cache: Optional[ResponseCache] = None,
+        resolutions: ResolutionBroker = resolution_broker,
     ) -> None:
         self.settings = get_settings()
+        self.session = session
+        self.cache = cache or get_response_cache()
         self.repo = HelpRequestRepository(session)
         self.kb_repo = KnowledgeBaseRepository(session)
+        self.stats = StatsService(session)
         self.notifier = notifier
+        self.resolutions = resolutions
 
     def list_requests(
         self, *, status: Optional[RequestStatus] = None
@@ -42,13 +67,18 @@ class HelpRequestService:
         channel: str,
         customer_contact: Optional[str],
     ) -> HelpRequest:
+        question_key = normalize_question(question)
+        primary = self._coalescing_target(question_key)
         orm = self.repo.create(
             customer_name=customer_name,
             channel=channel,
             question=question,
             customer_contact=customer_contact,
             history_message="AI escalated to supervisor",
+            question_key=question_key,
+            coalesced_into=primary.id if primary else None,
         )
+        self.stats.record_escalation(channel)
         acknowledgement = (
             "Hi there! I've got your question and I'm looping in my supervisor "
             "so we can get you the right answer."
@@ -61,13 +91,23 @@ class HelpRequestService:
                 message=acknowledgement,
             )
         )
-        self.notifier.notify_supervisor(
-            NotificationPayload(
-                recipient="Supervisor On-call",
-                channel="console",
-                message=f"Hey, I need help answering '{question}'.",
+        if primary:
+            self.repo.add_history(
+                orm, f"Grouped with pending request {primary.id}; supervisor already asked."
             )
-        )
+            self.repo.add_history(
+                primary, f"{customer_name} asked the same question (request {orm.id})."
+            )
+            self._invalidate_request(primary.id)
+        else:
+            self.notifier.notify_supervisor(
+                NotificationPayload(
+                    recipient="Supervisor On-call",
+                    channel="console",
+                    message=f"Hey, I need help answering '{question}'.",
+                )
+            )
+        self._invalidate_request(orm.id)
         return HelpRequest.model_validate(orm)
 
     def record_response(
@@ -84,18 +124,64 @@ class HelpRequestService:
         if not orm:
             raise ValueError(f"Request {request_id} not found")
 
-        response = self.repo.attach_response(
+        topic = topic or self.settings.knowledge_base_auto_tag
+        response = self._deliver_response(
             orm,
             answer=answer,
-            topic=topic or self.settings.knowledge_base_auto_tag,
+            topic=topic,
             unresolved=unresolved,
             notes=notes,
+            follow_up_minutes=follow_up_minutes,
         )
 
         kb_entry = None
         if not unresolved:
             kb = self.kb_repo.create_from_response(request=orm, response=response)
             kb_entry = KnowledgeBaseEntry.model_validate(kb)
+            self.cache.invalidate_after_commit(
+                self.session, ResponseCache.key(KNOWLEDGE_BASE_ROUTE)
+            )
+            mark_knowledge_base_changed(self.session)
+
+        # Customers whose identical question was grouped under this request get
+        # the same answer without another supervisor round-trip.
+        for follower in self.repo.list_coalesced(orm.id):
+            self.repo.add_history(follower, f"Answer shared from grouped request {orm.id}.")
+            self._deliver_response(
+                follower,
+                answer=answer,
+                topic=topic,
+                unresolved=unresolved,
+                notes=notes,
+                follow_up_minutes=follow_up_minutes,
+            )
+
+        return HelpRequest.model_validate(orm), kb_entry
+
+    def _deliver_response(
+        self,
+        orm: HelpRequestORM,
+        *,
+        answer: str,
+        topic: str,
+        unresolved: bool,
+        notes: Optional[str],
+        follow_up_minutes: Optional[int],
+    ) -> SupervisorResponseORM:
+        previous_status = orm.status
+        response = self.repo.attach_response(
+            orm,
+            answer=answer,
+            topic=topic,
+            unresolved=unresolved,
+            notes=notes,
+        )
+        self.stats.record_status_change(previous_status, orm.status)
+        self.stats.record_response(topic)
+        if orm.status == RequestStatus.resolved.value and previous_status != orm.status:
+            self.stats.record_resolution(orm)
+
+        if not unresolved:
             self.repo.clear_follow_up(orm)
             message = answer
             closing = self.settings.post_resolution_followup.strip()
@@ -135,7 +221,16 @@ class HelpRequestService:
             )
         )
 
-        return HelpRequest.model_validate(orm), kb_entry
+        self._invalidate_request(orm.id)
+        # Live calls waiting on this request hear the answer once it is durable.
+        resolution = Resolution(request_id=orm.id, answer=answer, unresolved=unresolved)
+        event.listen(
+            self.session,
+            "after_commit",
+            lambda _session: self.resolutions.publish(resolution),
+            once=True,
+        )
+        return response
 
     def mark_timeout(
         self, request_id: str, follow_up_minutes: Optional[int] = None
@@ -143,7 +238,9 @@ class HelpRequestService:
         orm = self.repo.get(request_id)
         if not orm:
             raise ValueError(f"Request {request_id} not found")
+        previous_status = orm.status
         self.repo.mark_timeout(orm)
+        self.stats.record_status_change(previous_status, orm.status)
         minutes = self._normalize_follow_up_minutes(follow_up_minutes)
         follow_up_at = datetime.utcnow() + timedelta(minutes=minutes)
         self.repo.schedule_follow_up(orm, follow_up_at)
@@ -161,37 +258,93 @@ class HelpRequestService:
                 ),
             )
         )
+        self._invalidate_request(orm.id)
         return HelpRequest.model_validate(orm)
 
+    def sweep_timeouts(self, *, now: Optional[datetime] = None) -> int:
+        """Time out pending requests older than ``request_timeout_minutes``."""
+        current_time = now or datetime.utcnow()
+        cutoff = current_time - timedelta(minutes=self.settings.request_timeout_minutes)
+        overdue = self.repo.list_overdue_pending(cutoff)
+        for request in overdue:
+            self.mark_timeout(request.id)
+        return len(overdue)
+
     def list_knowledge_base(self) -> list[KnowledgeBaseEntry]:
         entries = self.kb_repo.list()
         return [KnowledgeBaseEntry.model_validate(item) for item in entries]
 
+    def export_requests(
+        self,
+        *,
+        fmt: str,
+        status: Optional[RequestStatus] = None,
+        batch_size: int = 500,
+    ) -> Iterator[str]:
+        rows = (
+            HelpRequest.model_validate(item)
+            for item in self.repo.iter_all(status, batch_size=batch_size)
+        )
+        return serialize(rows, fmt=fmt, fields=list(HelpRequest.model_fields))
+
+    def export_knowledge_base(self, *, fmt: str, batch_size: int = 500) -> Iterator[str]:
+        rows = (
+            KnowledgeBaseEntry.model_validate(item)
+            for item in self.kb_repo.iter_all(batch_size=batch_size)
+        )
+        return serialize(rows, fmt=fmt, fields=list(KnowledgeBaseEntry.model_fields))
+
     def send_due_follow_up_reminders(
-        self, *, now: Optional[datetime] = None
+        self, *, now: Optional[datetime] = None, batch_size: Optional[int] = None
     ) -> int:
+        """Claim due reminders in bounded batches and notify each customer once.
+
+        Rows are claimed by ``claim_due_followups`` before any notification is
+        sent, so several dispatchers (API calls, scheduler passes, processes) can
+        run concurrently without double-sending.
+        """
         current_time = now or datetime.utcnow()
-        due_requests = self.repo.list_due_followups(current_time)
+        limit = batch_size or self.settings.follow_up_dispatch_batch_size
+        reminder_message = (
+            "Thanks for your patience — I'm still working on this and will "
+            "update you as soon as I have news."
+        )
         count = 0
-        for request in due_requests:
-            reminder_message = (
-                "Thanks for your patience — I'm still working on this and will "
-                "update you as soon as I have news."
+        while True:
+            claimed = DueReminderQueue.from_rows(
+                self.repo.claim_due_followups(current_time, limit=limit)
             )
-            self.notifier.notify_customer(
-                NotificationPayload(
-                    recipient=request.customer_name,
-                    channel=request.channel,
-                    message=reminder_message,
+            for reminder in claimed:
+                self.notifier.notify_customer(
+                    NotificationPayload(
+                        recipient=reminder.customer_name,
+                        channel=reminder.channel,
+                        message=reminder_message,
+                    )
                 )
-            )
-            self.repo.add_history(
-                request,
+                self._invalidate_request(reminder.request_id)
+            self.repo.add_history_many(
+                claimed.request_ids,
                 "Automated reminder sent: still working, will follow up shortly.",
             )
-            self.repo.mark_follow_up_reminder_sent(request)
-            count += 1
-        return count
+            count += len(claimed)
+            if len(claimed) < limit:
+                return count
+
+    def _coalescing_target(self, question_key: str) -> Optional[HelpRequestORM]:
+        window = self.settings.escalation_coalesce_window_seconds
+        if not window or not question_key:
+            return None
+        # Without the lock, two simultaneous escalations would both find no
+        # primary and both page the supervisor.
+        self.repo.lock_question_key(question_key)
+        since = datetime.utcnow() - timedelta(seconds=window)
+        return self.repo.find_coalescing_primary(question_key, since=since)
+
+    def _invalidate_request(self, request_id: str) -> None:
+        self.cache.invalidate_after_commit(
+            self.session, ResponseCache.key(HELP_REQUEST_ROUTE, request_id=request_id)
+        )
 
     def _normalize_follow_up_minutes(self, value: Optional[int]) -> int:
         if value is None or value <= 0:
@@ -0,0 +1,76 @@
+"""Replay of POST responses for clients that retry with an ``Idempotency-Key``.
+
+The key is claimed in the same transaction as the service writes, and the
+serialized response is stored before that transaction commits. A retry then
+either replays the stored response or, if the first attempt failed and rolled
+back, runs again as if it were the first attempt.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..repository import IdempotencyRepository
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """The key was already used with a different request payload."""
+
+
+class IdempotencyKeyInProgress(ValueError):
+    """Another request with the same key has not finished yet."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: str
+
+
+def request_hash(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IdempotencyService:
+    def __init__(self, session: Session, *, ttl_seconds: Optional[int] = None) -> None:
+        self.session = session
+        self.repo = IdempotencyRepository(session)
+        self.ttl = timedelta(
+            seconds=ttl_seconds or get_settings().idempotency_key_ttl_seconds
+        )
+
+    def begin(
+        self, scope: str, key: str, payload: str, *, now: Optional[datetime] = None
+    ) -> Optional[StoredResponse]:
+        """Claim ``key`` and return None, or return the response stored for it."""
+        current_time = now or datetime.utcnow()
+        digest = request_hash(payload)
+        if self._claim(scope, key, digest, current_time):
+            return None
+        record = self.repo.get(scope, key)
+        if record is None:
+            # Evicted between the claim attempt and the lookup.
+            if self._claim(scope, key, digest, current_time):
+                return None
+            raise IdempotencyKeyInProgress(f"Idempotency key '{key}' is being processed")
+        if record.request_hash != digest:
+            raise IdempotencyKeyMismatch(
+                f"Idempotency key '{key}' was already used with a different request"
+            )
+        if record.status_code is None:
+            raise IdempotencyKeyInProgress(f"Idempotency key '{key}' is being processed")
+        return StoredResponse(status_code=record.status_code, body=record.body or "")
+
+    def complete(self, scope: str, key: str, *, status_code: int, body: str) -> None:
+        self.repo.complete(scope, key, status_code=status_code, body=body)
+
+    def purge_expired(self, *, now: Optional[datetime] = None) -> int:
+        return self.repo.delete_expired(now or datetime.utcnow())
+
+    def _claim(self, scope: str, key: str, digest: str, now: datetime) -> bool:
+        return self.repo.claim(scope, key, digest, now=now, expires_at=now + self.ttl)
@@ -0,0 +1,136 @@
+"""Bulk knowledge-base import and change notification."""
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import KnowledgeBaseEntryORM, normalize_question
+from ..repository import CoordinationRepository, KnowledgeBaseRepository
+
+IMPORT_SOURCE_ID = "bulk-import"
+KNOWLEDGE_BASE_CHANNEL = "knowledge_base"
+TOPIC_MAX_LENGTH = KnowledgeBaseEntryORM.__table__.c.topic.type.length
+
+KnowledgeBaseListener = Callable[[], None]
+_listeners: list[KnowledgeBaseListener] = []
+
+
+def on_knowledge_base_changed(listener: KnowledgeBaseListener) -> KnowledgeBaseListener:
+    """Register a callback for in-process KB indexes that must be refreshed."""
+    _listeners.append(listener)
+    return listener
+
+
+def remove_knowledge_base_listener(listener: KnowledgeBaseListener) -> None:
+    """Unregister a callback added with ``on_knowledge_base_changed``."""
+    try:
+        _listeners.remove(listener)
+    except ValueError:
+        pass
+
+
+def notify_knowledge_base_changed() -> None:
+    for listener in list(_listeners):
+        listener()
+
+
+def mark_knowledge_base_changed(session: Session) -> None:
+    """Record a KB write for every process and refresh local indexes on commit.
+
+    The version bump rides in the caller's transaction; other processes pick it
+    up through their ``ChangeWatcher``.
+    """
+    CoordinationRepository(session).bump_version(KNOWLEDGE_BASE_CHANNEL)
+    event.listen(
+        session, "after_commit", lambda _session: notify_knowledge_base_changed(), once=True
+    )
+
+
+def parse_rows(lines: Iterable[str], fmt: str) -> Iterator[dict]:
+    if fmt == "ndjson":
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield _validated(json.loads(line), line_number)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Line {line_number}: invalid JSON ({exc.msg})") from exc
+    elif fmt == "csv":
+        # Line 1 is the header row.
+        for line_number, row in enumerate(csv.DictReader(lines), start=2):
+            yield _validated(row, line_number)
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}'")
+
+
+def _validated(row: object, line_number: int) -> dict:
+    if not isinstance(row, dict):
+        raise ValueError(f"Line {line_number}: expected an object")
+    question = str(row.get("question") or "").strip()
+    answer = str(row.get("answer") or "").strip()
+    if not question or not answer:
+        raise ValueError(f"Line {line_number}: 'question' and 'answer' are required")
+    topic = row.get("topic")
+    if topic is not None:
+        if not isinstance(topic, str):
+            raise ValueError(f"Line {line_number}: 'topic' must be a string")
+        topic = topic.strip() or None
+        if topic and len(topic) > TOPIC_MAX_LENGTH:
+            raise ValueError(
+                f"Line {line_number}: 'topic' is longer than {TOPIC_MAX_LENGTH} characters"
+            )
+    return {"question": question, "answer": answer, "topic": topic}
+
+
+@dataclass
+class ImportResult:
+    processed: int
+    batches: int
+
+
+class KnowledgeBaseImporter:
+    """Streams validated rows into ``knowledge_base`` in fixed-size upsert batches."""
+
+    def __init__(self, session: Session, *, chunk_size: Optional[int] = None) -> None:
+        self.settings = get_settings()
+        self.session = session
+        self.kb_repo = KnowledgeBaseRepository(session)
+        self.chunk_size = chunk_size or self.settings.knowledge_base_import_chunk_size
+
+    def import_rows(self, rows: Iterable[dict]) -> ImportResult:
+        processed = 0
+        batches = 0
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                break
+            now = datetime.utcnow()
+            processed += self.kb_repo.upsert_many(
+                [
+                    {
+                        "source_request_id": IMPORT_SOURCE_ID,
+                        "topic": row.get("topic") or self.settings.knowledge_base_auto_tag,
+                        "question": row["question"],
+                        "answer": row["answer"],
+                        "question_key": normalize_question(row["question"]),
+                        "updated_at": now,
+                    }
+                    for row in chunk
+                ]
+            )
+            batches += 1
+        if batches:
+            mark_knowledge_base_changed(self.session)
+        return ImportResult(processed=processed, batches=batches)
+
+    def import_lines(self, lines: Iterable[str], *, fmt: str) -> ImportResult:
+        return self.import_rows(parse_rows(lines, fmt))
@@ -1,16 +1,67 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
 
 from ..config import get_settings
 from ..db import db_session
-from ..models import KnowledgeBaseEntry
+from ..models import HelpRequest, RequestStatus
+from ..profiling import maybe_profile
+from ..repository import KnowledgeBaseRepository
+from .compact import KnowledgeBaseSnapshot
+from .coordination import get_knowledge_base_watcher
 from .help_requests import HelpRequestService
+from .knowledge_base import on_knowledge_base_changed
+from .notifications import NotificationSink, console_notifier
+from .resolutions import Resolution, ResolutionBroker, resolution_broker
 
 PROMPT_PATH = Path(__file__).resolve().parents[2] / "prompts" / "salon_profile.md"
 
 
+class KnowledgeBaseSnapshotCache:
+    """Process-wide compact KB snapshot, rebuilt after the KB changes.
+
+    Local writes drop it through ``on_knowledge_base_changed``; writes from other
+    processes are noticed by the throttled ``ChangeWatcher`` poll. Only the
+    module's ``knowledge_base_snapshots`` is registered for local writes; other
+    instances must register (and remove) their own ``invalidate``.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: Optional[KnowledgeBaseSnapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, session: Session) -> KnowledgeBaseSnapshot:
+        get_knowledge_base_watcher().poll(session)
+        with self._lock:
+            snapshot, generation = self._snapshot, self._generation
+        if snapshot is not None:
+            return snapshot
+        snapshot = KnowledgeBaseSnapshot.from_rows(
+            KnowledgeBaseRepository(session).iter_snapshot_rows()
+        )
+        with self._lock:
+            # Skip caching if an invalidation raced with the rebuild.
+            if generation == self._generation:
+                self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+
+knowledge_base_snapshots = KnowledgeBaseSnapshotCache()
+on_knowledge_base_changed(knowledge_base_snapshots.invalidate)
+
+
 class LiveKitAgentBridge:
     """Shim that would connect to the LiveKit Python SDK.
 
@@ -19,8 +70,19 @@ class LiveKitAgentBridge:
     attempt to answer based on the knowledge base and escalate when stuck.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], AbstractContextManager[Session]] = db_session,
+        notifier: NotificationSink = console_notifier,
+        resolutions: ResolutionBroker = resolution_broker,
+        snapshot_cache: Optional[KnowledgeBaseSnapshotCache] = None,
+    ) -> None:
         self.settings = get_settings()
+        self.session_factory = session_factory
+        self.notifier = notifier
+        self.resolutions = resolutions
+        self.snapshot_cache = snapshot_cache or knowledge_base_snapshots
         if PROMPT_PATH.exists():
             self.system_prompt = PROMPT_PATH.read_text(encoding="utf-8")
         else:  # pragma: no cover
@@ -36,33 +98,75 @@ class LiveKitAgentBridge:
     ) -> Optional[str]:
         """Return an answer if found, otherwise escalate."""
 
-        kb_entries = self._fetch_kb()
-        answer = self._match_answer(kb_entries, question)
-        if answer:
-            print(f"[AI -> {customer_name}] {answer}")
-            return answer
+        with maybe_profile("bridge.handle_customer_question"):
+            answer = self.answer_from_knowledge_base(question)
+            if answer:
+                print(f"[AI -> {customer_name}] {answer}")
+                return answer
+
+            self.escalate(
+                customer_name=customer_name,
+                channel=channel,
+                question=question,
+                customer_contact=customer_contact,
+            )
+            return None
 
-        with db_session() as session:
-            service = HelpRequestService(session)
-            service.create_escalation(
+    def answer_from_knowledge_base(self, question: str) -> Optional[str]:
+        return self.knowledge_base_snapshot().match(question)
+
+    def escalate(
+        self,
+        *,
+        customer_name: str,
+        channel: str,
+        question: str,
+        customer_contact: Optional[str] = None,
+    ) -> HelpRequest:
+        with self.session_factory() as session:
+            service = HelpRequestService(session, notifier=self.notifier)
+            return service.create_escalation(
                 customer_name=customer_name,
                 question=question,
                 channel=channel,
                 customer_contact=customer_contact,
             )
-        return None
 
-    def _fetch_kb(self) -> list[KnowledgeBaseEntry]:
-        with db_session() as session:
-            service = HelpRequestService(session)
-            return service.list_knowledge_base()
+    async def wait_for_resolution(
+        self, request_id: str, timeout: float, *, seen: Optional[Resolution] = None
+    ) -> Optional[Resolution]:
+        """Wait up to ``timeout`` seconds for a supervisor answer to ``request_id``.
+
+        The subscription is registered before the first status check so an
+        answer recorded in between is not missed. Answers recorded by another
+        process are not published here, so the database is checked once more
+        when the wait runs out; nothing polls in between. ``seen`` is an
+        answer the caller already has (an interim one), which is not returned
+        again from those checks.
+        """
+        future = self.resolutions.subscribe(request_id)
+        try:
+            existing = await asyncio.to_thread(self._recorded_resolution, request_id)
+            if existing and existing != seen:
+                return existing
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            recorded = await asyncio.to_thread(self._recorded_resolution, request_id)
+            return recorded if recorded != seen else None
+        finally:
+            self.resolutions.unsubscribe(request_id, future)
 
-    @staticmethod
-    def _match_answer(entries: list[KnowledgeBaseEntry], question: str) -> Optional[str]:
-        if not entries:
+    def _recorded_resolution(self, request_id: str) -> Optional[Resolution]:
+        with self.session_factory() as session:
+            request = HelpRequestService(session, notifier=self.notifier).get_request(request_id)
+        if request.status == RequestStatus.pending or not request.answer:
             return None
-        q_lower = question.lower()
-        for entry in entries:
-            if entry.question.lower() in q_lower or q_lower in entry.question.lower():
-                return entry.answer
-        return None
+        return Resolution(
+            request_id=request.id,
+            answer=request.answer,
+            unresolved=request.status == RequestStatus.unresolved,
+        )
+
+    def knowledge_base_snapshot(self) -> KnowledgeBaseSnapshot:
+        with self.session_factory() as session:
+            return self.snapshot_cache.get(session)
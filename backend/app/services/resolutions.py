@@ -0,0 +1,55 @@
+"""In-process pub/sub that delivers supervisor answers to callers still on the line."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Resolution:
+    request_id: str
+    answer: str
+    unresolved: bool
+
+
+class ResolutionBroker:
+    """Maps help-request ids to futures awaited by live calls.
+
+    ``publish`` is called from the (threaded) service layer; results are handed
+    to each subscriber's event loop with ``call_soon_threadsafe``. Subscribers
+    in other processes are not reached; they keep the follow-up notification.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, request_id: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._waiters.setdefault(request_id, []).append((loop, future))
+        return future
+
+    def unsubscribe(self, request_id: str, future: asyncio.Future) -> None:
+        with self._lock:
+            waiters = self._waiters.get(request_id, [])
+            self._waiters[request_id] = [item for item in waiters if item[1] is not future]
+            if not self._waiters[request_id]:
+                del self._waiters[request_id]
+
+    def publish(self, resolution: Resolution) -> int:
+        with self._lock:
+            waiters = self._waiters.pop(resolution.request_id, [])
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, resolution)
+        return len(waiters)
+
+
+def _resolve(future: asyncio.Future, resolution: Resolution) -> None:
+    if not future.done():
+        future.set_result(resolution)
+
+
+resolution_broker = ResolutionBroker()
@@ -0,0 +1,87 @@
+"""Retention policy: move old, closed help requests out of the hot tables."""
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..cache import HELP_REQUEST_ROUTE, ResponseCache, get_response_cache
+from ..config import get_settings
+from ..models import HelpRequest, HelpRequestORM
+from ..repository import HelpRequestRepository, incremental_vacuum
+
+
+@dataclass
+class ArchiveResult:
+    archived: int
+    batches: int
+    path: Optional[str] = None
+    vacuumed: bool = False
+
+
+class ArchivalService:
+    """Archives resolved/unresolved requests past the retention window.
+
+    Each batch is appended to a gzipped NDJSON file (one request per line with
+    its supervisor responses embedded) and then deleted in its own transaction,
+    so a crash mid-run leaves at worst a duplicated line, never a lost request.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        archive_dir: Optional[str] = None,
+    ) -> None:
+        self.settings = get_settings()
+        self.session = session
+        self.repo = HelpRequestRepository(session)
+        self.retention_days = retention_days or self.settings.retention_days
+        self.batch_size = batch_size or self.settings.retention_batch_size
+        self.archive_dir = Path(archive_dir or self.settings.archive_dir)
+
+    def archive_expired(self, *, now: Optional[datetime] = None) -> ArchiveResult:
+        if not self.retention_days:
+            return ArchiveResult(archived=0, batches=0)
+
+        current_time = now or datetime.utcnow()
+        cutoff = current_time - timedelta(days=self.retention_days)
+        path = self.archive_dir / f"help_requests-{current_time:%Y%m%dT%H%M%S}.ndjson.gz"
+        archived = 0
+        batches = 0
+
+        while True:
+            batch = self.repo.list_archivable(cutoff, limit=self.batch_size)
+            if not batch:
+                break
+            if not batches:
+                self.archive_dir.mkdir(parents=True, exist_ok=True)
+            with gzip.open(path, "at", encoding="utf-8") as archive:
+                for request in batch:
+                    archive.write(self._archive_line(request))
+            request_ids = [request.id for request in batch]
+            self.repo.delete_many(request_ids)
+            self.session.commit()
+            get_response_cache().invalidate(
+                *(ResponseCache.key(HELP_REQUEST_ROUTE, request_id=rid) for rid in request_ids)
+            )
+            archived += len(batch)
+            batches += 1
+
+        if not batches:
+            return ArchiveResult(archived=0, batches=0)
+        vacuumed = incremental_vacuum(self.session)
+        self.session.commit()
+        return ArchiveResult(archived=archived, batches=batches, path=str(path), vacuumed=vacuumed)
+
+    @staticmethod
+    def _archive_line(request: HelpRequestORM) -> str:
+        record = HelpRequest.model_validate(request).model_dump(mode="json")
+        return json.dumps(record, separators=(",", ":")) + "\n"
@@ -0,0 +1,210 @@
+"""Dashboard aggregates maintained incrementally by ``HelpRequestService`` writes.
+
+Every escalation, response and timeout appends a few ``stat_events`` rows in
+its own transaction; nothing shared is updated, so concurrent writers do not
+queue behind each other. ``rollup`` folds those events into the counter rows
+and latency histogram, and runs before every read and on each maintenance
+pass, so reading the stats never scans the request tables. ``rebuild``
+recomputes everything from the request tables for databases that predate
+the counters.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..models import HelpRequestORM, RequestStatus
+from ..repository import StatsRepository
+
+STATUS = "status"
+CHANNEL = "channel"
+TOPIC = "topic"
+LATENCY = "latency"
+
+# Upper bounds, in seconds, of the time-to-resolve histogram buckets; one more
+# bucket collects everything slower than a week.
+LATENCY_BUCKETS = (
+    30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 14400, 28800, 86400, 259200, 604800,
+)
+PERCENTILES = (50, 90, 95, 99)
+ROLLUP_BATCH_SIZE = 1000
+
+
+def latency_bucket(seconds: float) -> int:
+    return bisect_left(LATENCY_BUCKETS, seconds)
+
+
+@dataclass
+class LatencySummary:
+    count: int = 0
+    mean_seconds: Optional[float] = None
+    percentiles: dict[str, Optional[float]] = field(default_factory=dict)
+
+
+@dataclass
+class StatsSummary:
+    total: int
+    by_status: dict[str, int]
+    by_channel: dict[str, int]
+    by_topic: dict[str, int]
+    resolution_rate: Optional[float]
+    time_to_resolve: LatencySummary
+
+
+class StatsService:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.repo = StatsRepository(session)
+
+    # ----- incremental updates -----
+
+    def record_escalation(self, channel: str) -> None:
+        self._add({(STATUS, RequestStatus.pending.value): 1, (CHANNEL, channel): 1})
+
+    def record_status_change(self, previous: str, current: str) -> None:
+        if previous != current:
+            self._add({(STATUS, previous): -1, (STATUS, current): 1})
+
+    def record_response(self, topic: str) -> None:
+        self._add({(TOPIC, topic): 1})
+
+    def record_resolution(self, request: HelpRequestORM) -> None:
+        if request.resolved_at is None:
+            return
+        seconds = max((request.resolved_at - request.escalated_at).total_seconds(), 0.0)
+        self.repo.add_events(
+            [{"dimension": LATENCY, "key": LATENCY, "delta": 1, "seconds": seconds}]
+        )
+
+    def rollup(self) -> int:
+        """Fold pending events into the totals; returns how many were folded."""
+        folded = 0
+        while True:
+            events = self.repo.take_events(limit=ROLLUP_BATCH_SIZE)
+            deltas: Counter[tuple[str, str]] = Counter()
+            latencies: list[float] = []
+            for dimension, key, delta, seconds in events:
+                if dimension == LATENCY:
+                    latencies.append(seconds)
+                else:
+                    deltas[(dimension, key)] += delta
+            self.repo.bump(deltas)
+            self._record_latencies(latencies)
+            folded += len(events)
+            if len(events) < ROLLUP_BATCH_SIZE:
+                return folded
+
+    def _add(self, deltas: dict[tuple[str, str], int]) -> None:
+        self.repo.add_events(
+            [
+                {"dimension": dimension, "key": key, "delta": delta, "seconds": None}
+                for (dimension, key), delta in deltas.items()
+            ]
+        )
+
+    def _record_latencies(self, latencies: Iterable[float]) -> None:
+        # bucket -> [count, total, min, max]; a stream, so rebuilds stay flat.
+        grouped: dict[int, list[float]] = {}
+        for seconds in latencies:
+            bucket = latency_bucket(seconds)
+            row = grouped.get(bucket)
+            if row is None:
+                grouped[bucket] = [1, seconds, seconds, seconds]
+            else:
+                row[0] += 1
+                row[1] += seconds
+                row[2] = min(row[2], seconds)
+                row[3] = max(row[3], seconds)
+        for bucket, (count, total, low, high) in sorted(grouped.items()):
+            self.repo.record_latency(
+                bucket,
+                count=int(count),
+                total_seconds=total,
+                min_seconds=low,
+                max_seconds=high,
+            )
+
+    # ----- reads -----
+
+    def summary(self) -> StatsSummary:
+        self.rollup()
+        grouped: dict[str, dict[str, int]] = {STATUS: {}, CHANNEL: {}, TOPIC: {}}
+        for dimension, key, count in self.repo.counters():
+            grouped.setdefault(dimension, {})[key] = count
+        by_status = {status.value: 0 for status in RequestStatus}
+        by_status.update(grouped[STATUS])
+        resolved = by_status.get(RequestStatus.resolved.value, 0)
+        closed = resolved + by_status.get(RequestStatus.unresolved.value, 0)
+        return StatsSummary(
+            total=sum(by_status.values()),
+            by_status=by_status,
+            by_channel=grouped[CHANNEL],
+            by_topic=grouped[TOPIC],
+            resolution_rate=resolved / closed if closed else None,
+            time_to_resolve=self._latency_summary(),
+        )
+
+    def rebuild(self) -> StatsSummary:
+        """Recompute all counters from the request and response tables.
+
+        Archived requests are no longer in those tables, so they drop out of
+        the rebuilt figures.
+        """
+        self.repo.clear()
+        deltas: dict[tuple[str, str], int] = {}
+        for status, count in self.repo.count_requests_by(HelpRequestORM.status):
+            deltas[(STATUS, status)] = count
+        for channel, count in self.repo.count_requests_by(HelpRequestORM.channel):
+            deltas[(CHANNEL, channel)] = count
+        for topic, count in self.repo.count_responses_by_topic():
+            deltas[(TOPIC, topic)] = count
+        self.repo.bump(deltas)
+
+        self._record_latencies(
+            max((resolved_at - escalated_at).total_seconds(), 0.0)
+            for escalated_at, resolved_at in self.repo.iter_resolution_times()
+        )
+        self.session.flush()
+        return self.summary()
+
+    def _latency_summary(self) -> LatencySummary:
+        buckets = [row for row in self.repo.latency_buckets() if row.count]
+        count = sum(row[1] for row in buckets)
+        if not count:
+            return LatencySummary(percentiles={f"p{q}": None for q in PERCENTILES})
+        return LatencySummary(
+            count=count,
+            mean_seconds=sum(row[2] for row in buckets) / count,
+            percentiles={f"p{q}": _percentile(buckets, count, q) for q in PERCENTILES},
+        )
+
+
+def _percentile(buckets: list[Row], count: int, q: int) -> float:
+    """Estimate the ``q``th percentile, interpolating linearly inside a bucket.
+
+    The interpolation runs between the fastest and slowest durations the
+    bucket has seen, not its edges, so a bucket of 30 ms resolutions reports
+    30 ms rather than a point between 0 and 30 s.
+    """
+    rank = q / 100 * count
+    seen = 0
+    for bucket, bucket_count, bucket_total, low, high in buckets:
+        if seen + bucket_count >= rank:
+            lower = LATENCY_BUCKETS[bucket - 1] if bucket else 0.0
+            upper = LATENCY_BUCKETS[bucket] if bucket < len(LATENCY_BUCKETS) else None
+            # Buckets written by older releases have no min/max.
+            if low is not None:
+                lower = max(lower, low)
+            if high is not None:
+                upper = high if upper is None else min(upper, high)
+            if upper is None:
+                # Unbounded bucket: its mean is the best estimate available.
+                return bucket_total / bucket_count
+            return lower + (upper - lower) * (rank - seen) / bucket_count
+        seen += bucket_count
+    return buckets[-1].total_seconds / buckets[-1].count
@@ -0,0 +1 @@
+"""Performance benchmarks. Run individually, e.g. ``python -m benchmarks.bench_startup``."""
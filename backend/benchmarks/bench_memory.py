@@ -0,0 +1,115 @@
+"""Memory footprint of the in-memory KB snapshot and reminder batches at 100k rows.
+
+Compares the Pydantic/ORM objects the bridge and dispatcher used to hold with
+the compact containers in ``app.services.compact``, measured with tracemalloc.
+
+Usage::
+
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --rows 250000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable
+
+from app.models import HelpRequestORM, KnowledgeBaseEntry
+from app.services.compact import DueReminderQueue, KnowledgeBaseSnapshot
+
+TOPICS = ["Hours", "Pricing", "Services", "Scheduling", "Location", "General"]
+
+
+def kb_rows(count: int) -> list[tuple]:
+    base = datetime(2024, 1, 1)
+    return [
+        (
+            index,
+            "bulk-import",
+            # Fresh strings, as a database driver would return them.
+            "".join(TOPICS[index % len(TOPICS)]),
+            f"What is the answer to frequently asked question number {index}?",
+            f"Here is the answer for question {index}, straight from the salon team.",
+            base + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def reminder_rows(count: int) -> list[tuple]:
+    base = datetime(2024, 1, 1)
+    return [
+        (
+            f"{index:032x}",
+            f"Customer {index}",
+            "".join(["s", "m", "s"]),
+            base + timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def measure(build: Callable[[], object]) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    result = build()
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return end - start, result
+
+
+def report(label: str, baseline: int, compact: int, rows: int) -> None:
+    print(
+        f"{label:<18} baseline {baseline / rows:8.1f} B/row  "
+        f"compact {compact / rows:8.1f} B/row  ({baseline / compact:4.1f}x smaller)"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Rows are generated inside each measurement so the retained strings are
+    # counted for both representations; the row tuples themselves are freed.
+    baseline, _ = measure(
+        lambda: [
+            KnowledgeBaseEntry(
+                id=r[0],
+                source_request_id=r[1],
+                topic=r[2],
+                question=r[3],
+                answer=r[4],
+                updated_at=r[5],
+            )
+            for r in kb_rows(args.rows)
+        ]
+    )
+    compact, _ = measure(lambda: KnowledgeBaseSnapshot.from_rows(kb_rows(args.rows)))
+    report("KB snapshot", baseline, compact, args.rows)
+
+    baseline, _ = measure(
+        lambda: [
+            HelpRequestORM(
+                id=r[0],
+                customer_name=r[1],
+                channel=r[2],
+                follow_up_at=r[3],
+                question="Do you have availability this week?",
+                history=[],
+            )
+            for r in reminder_rows(args.rows)
+        ]
+    )
+    compact, _ = measure(lambda: DueReminderQueue.from_rows(reminder_rows(args.rows)))
+    report("Reminder queue", baseline, compact, args.rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Cold-start import budget for the API and worker entry points.
+
+Each entry point is imported in a fresh interpreter under ``python -X importtime``
+and its cumulative import time is compared with a budget. The run also checks
+that importing does not create the database engine or load settings.
+
+Usage::
+
+    python -m benchmarks.bench_startup
+    STARTUP_BUDGET_WORKER_MS=100 python -m benchmarks.bench_startup --runs 5
+
+Budgets sit just above the medians measured when they were set. ``app.main`` is
+about 1.3-1.4 s, and that is almost entirely FastAPI itself (its OpenAPI models
+take roughly 0.5 s) plus SQLAlchemy's ORM, which the route signatures and models
+need at import time. Lazy loading did not shorten that path. It only keeps the
+engine, settings and LiveKit SDK out of the import. The API budget therefore
+guards against regressions rather than recording a speed-up. The worker entry
+point is the one that got faster.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = {
+    "app.main": float(os.environ.get("STARTUP_BUDGET_API_MS", 1500)),
+    "app.livekit_worker": float(os.environ.get("STARTUP_BUDGET_WORKER_MS", 100)),
+}
+
+LAZY_CHECK = (
+    "import {module}, app.config, app.db; "
+    "assert app.db.get_engine.cache_info().currsize == 0, 'engine created at import'; "
+    "assert app.config.get_settings.cache_info().currsize == 0, 'settings loaded at import'"
+)
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative ``-X importtime`` figure for ``module`` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        _, _, fields = line.partition("import time:")
+        parts = [part.strip() for part in fields.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def assert_lazy(module: str) -> None:
+    subprocess.run(
+        [sys.executable, "-c", LAZY_CHECK.format(module=module)],
+        cwd=BACKEND_DIR,
+        check=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in ENTRY_POINTS.items():
+        assert_lazy(module)
+        samples = [import_time_ms(module) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        status = "ok" if median <= budget else "OVER BUDGET"
+        failed |= median > budget
+        print(f"{module:<20} median {median:8.1f} ms  budget {budget:8.1f} ms  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.cache import get_response_cache
+from app.db import Base, get_db, get_session_factory
+from app.services.help_requests import HelpRequestService
+from app.services.livekit_agent import KnowledgeBaseSnapshotCache, LiveKitAgentBridge
+from app.services.notifications import NotificationPayload, NotificationSink
+
+
+class RecordingNotifier(NotificationSink):
+    def __init__(self) -> None:
+        self.customer_notifications: list[NotificationPayload] = []
+        self.supervisor_notifications: list[NotificationPayload] = []
+
+    def notify_supervisor(self, payload: NotificationPayload) -> None:
+        self.supervisor_notifications.append(payload)
+
+    def notify_customer(self, payload: NotificationPayload) -> None:
+        self.customer_notifications.append(payload)
+
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def make_test_engine():
+    """In-memory SQLite by default; ``TEST_DATABASE_URL`` selects e.g. Postgres.
+
+    External databases are reset with drop_all/create_all so every test starts
+    from empty tables.
+    """
+    if TEST_DATABASE_URL:
+        engine = create_engine(TEST_DATABASE_URL, echo=False, future=True)
+        Base.metadata.drop_all(bind=engine)
+    else:
+        # StaticPool keeps the single in-memory database visible to TestClient threads.
+        engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            echo=False,
+            future=True,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def engine():
+    engine = make_test_engine()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine, future=True)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """``db_session``-style scope factory: each scope commits and closes its session."""
+    factory = sessionmaker(bind=engine, future=True)
+
+    @contextmanager
+    def scope():
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    return scope
+
+
+@pytest.fixture
+def notifier() -> RecordingNotifier:
+    return RecordingNotifier()
+
+
+@pytest.fixture
+def service(session, notifier) -> HelpRequestService:
+    return HelpRequestService(session, notifier=notifier)
+
+
+@pytest.fixture
+def bridge(session_factory, notifier) -> LiveKitAgentBridge:
+    return LiveKitAgentBridge(
+        session_factory=session_factory,
+        notifier=notifier,
+        snapshot_cache=KnowledgeBaseSnapshotCache(),
+    )
+
+
+@pytest.fixture
+def client(engine, session_factory):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    factory = sessionmaker(bind=engine, future=True)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    get_response_cache().clear()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    get_response_cache().clear()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.services.help_requests import HelpRequestService
+from app.services.notifications import NotificationSink
+
+
+@pytest.fixture
+def concurrent_engine(engine, tmp_path):
+    """Engine whose sessions get their own connections.
+
+    The in-memory SQLite test engine hands every session the same connection,
+    so concurrent transactions need a database file.
+    """
+    if engine.dialect.name != "sqlite":
+        yield engine
+        return
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'coalescing.db'}", future=True)
+    Base.metadata.create_all(bind=file_engine)
+    yield file_engine
+    file_engine.dispose()
+
+
+class SlowSupervisorNotifier(NotificationSink):
+    """Holds the escalating transaction open after paging the supervisor."""
+
+    def __init__(self) -> None:
+        self.paged = threading.Event()
+        self.supervisor_notifications = 0
+
+    def notify_supervisor(self, payload) -> None:
+        self.supervisor_notifications += 1
+        self.paged.set()
+        time.sleep(0.3)
+
+    def notify_customer(self, payload) -> None:
+        pass
+
+
+def _escalate(service, name: str, question: str):
+    return service.create_escalation(
+        customer_name=name, question=question, channel="sms", customer_contact=None
+    )
+
+
+def test_identical_escalations_share_one_supervisor_task(service, notifier):
+    primary = _escalate(service, "Ana", "Is the salon open during the power outage?")
+    second = _escalate(service, "Ben", "is the salon open during the  power outage?")
+    other = _escalate(service, "Cy", "Do you sell gift cards?")
+
+    assert second.coalesced_into == primary.id
+    assert other.coalesced_into is None
+    assert len(notifier.supervisor_notifications) == 2
+
+    updated, kb_entry = service.record_response(
+        primary.id,
+        answer="We're closed until power is back.",
+        topic="Hours",
+        unresolved=False,
+        notes=None,
+    )
+
+    assert updated.status == "resolved"
+    assert service.get_request(second.id).status == "resolved"
+    assert service.get_request(second.id).answer == "We're closed until power is back."
+    assert service.get_request(other.id).status == "pending"
+    assert len(service.list_knowledge_base()) == 1
+    answered = {
+        payload.recipient
+        for payload in notifier.customer_notifications
+        if payload.message.startswith("We're closed")
+    }
+    assert answered == {"Ana", "Ben"}
+
+
+def test_coalescing_window_can_be_disabled(service, notifier):
+    service.settings = service.settings.model_copy(
+        update={"escalation_coalesce_window_seconds": 0}
+    )
+    first = _escalate(service, "Dee", "Can I bring my dog?")
+    second = _escalate(service, "Eli", "Can I bring my dog?")
+
+    assert second.coalesced_into is None
+    assert first.id != second.id
+    assert len(notifier.supervisor_notifications) == 2
+
+
+def test_final_answer_reaches_followers_after_an_interim_answer(service, notifier):
+    primary = _escalate(service, "Ana", "Are you open today?")
+    follower = _escalate(service, "Ben", "Are you open today?")
+    assert follower.coalesced_into == primary.id
+
+    service.record_response(
+        primary.id, answer="Checking.", topic="Hours", unresolved=True, notes=None
+    )
+    assert service.get_request(follower.id).status == "unresolved"
+
+    service.record_response(
+        primary.id, answer="Closed until 5pm.", topic="Hours", unresolved=False, notes=None
+    )
+
+    updated = service.get_request(follower.id)
+    assert updated.status == "resolved"
+    assert updated.answer == "Closed until 5pm."
+    final = {
+        payload.recipient
+        for payload in notifier.customer_notifications
+        if payload.message.startswith("Closed until 5pm.")
+    }
+    assert final == {"Ana", "Ben"}
+
+
+def test_concurrent_identical_escalations_page_the_supervisor_once(concurrent_engine):
+    factory = sessionmaker(bind=concurrent_engine, future=True)
+    notifier = SlowSupervisorNotifier()
+    results = {}
+
+    def escalate(name: str) -> None:
+        with factory() as session:
+            service = HelpRequestService(session, notifier=notifier)
+            results[name] = _escalate(service, name, "Is the salon open during the outage?")
+            session.commit()
+
+    first = threading.Thread(target=escalate, args=("Ana",))
+    first.start()
+    # Ben escalates while Ana's transaction is still open and uncommitted.
+    assert notifier.paged.wait(timeout=5)
+    second = threading.Thread(target=escalate, args=("Ben",))
+    second.start()
+    first.join()
+    second.join()
+
+    assert notifier.supervisor_notifications == 1
+    assert results["Ben"].coalesced_into == results["Ana"].id
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.services.compact import DueReminderQueue, KnowledgeBaseSnapshot
+from app.services.knowledge_base import (
+    KnowledgeBaseImporter,
+    on_knowledge_base_changed,
+    remove_knowledge_base_listener,
+)
+from app.services.livekit_agent import KnowledgeBaseSnapshotCache
+
+
+def test_snapshot_round_trips_to_api_models():
+    updated_at = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    snapshot = KnowledgeBaseSnapshot.from_rows(
+        [
+            (1, "bulk-import", "Hours", "Open Sundays?", "10am-4pm.", updated_at),
+            (2, "bulk-import", "Hours", "Open late?", "Until 9pm.", updated_at),
+        ]
+    )
+
+    assert len(snapshot) == 2
+    assert snapshot[0].topic is snapshot[1].topic
+    assert snapshot.match("Are you open sundays?") == "10am-4pm."
+    assert snapshot.match("Do you sell wigs?") is None
+    model = snapshot[1].to_model()
+    assert model.question == "Open late?"
+    assert model.updated_at == updated_at
+
+
+def test_reminder_queue_orders_by_follow_up_time():
+    now = datetime(2024, 5, 1, 9, 0)
+    queue = DueReminderQueue.from_rows(
+        [
+            ("b", "Bea", "sms", now + timedelta(minutes=5)),
+            ("a", "Al", "sms", now),
+        ]
+    )
+
+    assert queue.request_ids == ["a", "b"]
+    assert [reminder.follow_up_at for reminder in queue] == [now, now + timedelta(minutes=5)]
+
+
+def test_snapshot_cache_rebuilds_after_kb_changes(session):
+    cache = KnowledgeBaseSnapshotCache()
+    on_knowledge_base_changed(cache.invalidate)
+    try:
+        assert len(cache.get(session)) == 0
+
+        KnowledgeBaseImporter(session).import_rows(
+            [{"question": "Do you take cards?", "answer": "Yes, all major cards."}]
+        )
+        session.commit()
+
+        assert cache.get(session).match("do you take cards?") == "Yes, all major cards."
+    finally:
+        remove_knowledge_base_listener(cache.invalidate)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.services.coordination import ChangeWatcher, MaintenanceScheduler
+from app.services.knowledge_base import KNOWLEDGE_BASE_CHANNEL, KnowledgeBaseImporter
+
+
+def test_only_the_lease_holder_runs_maintenance(session_factory, service, session):
+    request = service.create_escalation(
+        customer_name="Robin",
+        question="Is parking free?",
+        channel="sms",
+        customer_contact=None,
+    )
+    session.commit()
+    first = MaintenanceScheduler(session_factory, holder="api-1")
+    second = MaintenanceScheduler(session_factory, holder="api-2")
+    later = datetime.utcnow() + timedelta(hours=1)
+
+    assert first.run_once(now=later)["timed_out"] == 1
+    assert second.run_once(now=later) is None
+    assert service.get_request(request.id).status == "unresolved"
+
+    # Once the holder stops renewing, another process takes over.
+    expired = later + timedelta(seconds=first.settings.scheduler_lease_seconds + 1)
+    assert second.run_once(now=expired) is not None
+    assert first.run_once(now=expired) is None
+
+
+def test_change_watcher_fires_when_another_process_writes_the_kb(session_factory, session):
+    changes: list[int] = []
+    watcher = ChangeWatcher(
+        KNOWLEDGE_BASE_CHANNEL, lambda: changes.append(1), interval_seconds=0
+    )
+    assert watcher.poll(session) is False
+
+    with session_factory() as other:
+        KnowledgeBaseImporter(other).import_rows(
+            [{"question": "Walk-ins welcome?", "answer": "Yes."}]
+        )
+
+    session.rollback()
+    assert watcher.poll(session) is True
+    assert watcher.poll(session) is False
+    assert changes == [1]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+
+def _seed(service, count: int) -> None:
+    for index in range(count):
+        request = service.create_escalation(
+            customer_name=f"Caller {index}",
+            question=f"Question {index}?",
+            channel="sms",
+            customer_contact=None,
+        )
+        if index % 2 == 0:
+            service.record_response(
+                request.id,
+                answer=f"Answer {index}.",
+                topic="Services",
+                unresolved=False,
+                notes=None,
+            )
+
+
+def test_ndjson_export_streams_one_line_per_request(service):
+    _seed(service, 5)
+
+    lines = list(service.export_requests(fmt="ndjson", batch_size=2))
+
+    assert len(lines) == 5
+    rows = [json.loads(line) for line in lines]
+    assert {row["question"] for row in rows} == {f"Question {i}?" for i in range(5)}
+    assert all(line.endswith("\n") for line in lines)
+
+
+def test_csv_export_of_knowledge_base(service):
+    _seed(service, 4)
+
+    payload = "".join(service.export_knowledge_base(fmt="csv", batch_size=1))
+    rows = list(csv.DictReader(io.StringIO(payload)))
+
+    assert len(rows) == 2
+    assert rows[0].keys() == {
+        "id",
+        "source_request_id",
+        "topic",
+        "question",
+        "answer",
+        "updated_at",
+    }
+    assert {row["answer"] for row in rows} == {"Answer 0.", "Answer 2."}
+
+
+def test_export_endpoints_stream_attachments(client, service, session):
+    _seed(service, 4)
+    session.commit()
+
+    requests = client.get("/api/help-requests/export", params={"status": "resolved"})
+    assert requests.status_code == 200
+    assert requests.headers["content-type"] == "application/x-ndjson"
+    assert (
+        requests.headers["content-disposition"]
+        == 'attachment; filename="help-requests.ndjson"'
+    )
+    rows = [json.loads(line) for line in requests.text.splitlines()]
+    assert sorted(row["question"] for row in rows) == ["Question 0?", "Question 2?"]
+
+    knowledge_base = client.get("/api/knowledge-base/export", params={"format": "csv"})
+    assert knowledge_base.status_code == 200
+    assert knowledge_base.headers["content-type"].startswith("text/csv")
+    assert (
+        knowledge_base.headers["content-disposition"]
+        == 'attachment; filename="knowledge-base.csv"'
+    )
+    rows = list(csv.DictReader(io.StringIO(knowledge_base.text)))
+    assert {row["answer"] for row in rows} == {"Answer 0.", "Answer 2."}
+
+    assert client.get("/api/knowledge-base/export", params={"format": "xml"}).status_code == 422
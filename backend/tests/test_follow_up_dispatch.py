@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.services.help_requests import HelpRequestService
+
+
+def _due_requests(service, count: int) -> list[str]:
+    ids = []
+    for index in range(count):
+        request = service.create_escalation(
+            customer_name=f"Caller {index}",
+            question="Any openings tomorrow?",
+            channel="sms",
+            customer_contact=None,
+        )
+        service.record_response(
+            request.id,
+            answer="Checking.",
+            topic="Scheduling",
+            unresolved=True,
+            notes=None,
+            follow_up_minutes=5,
+        )
+        ids.append(request.id)
+    return ids
+
+
+def test_dispatch_claims_in_batches_and_sends_each_reminder_once(session, service, notifier):
+    ids = _due_requests(service, 5)
+    later = datetime.utcnow() + timedelta(minutes=10)
+    before = len(notifier.customer_notifications)
+
+    assert service.send_due_follow_up_reminders(now=later, batch_size=2) == 5
+    assert service.send_due_follow_up_reminders(now=later, batch_size=2) == 0
+
+    reminders = notifier.customer_notifications[before:]
+    assert Counter(payload.recipient for payload in reminders) == Counter(
+        f"Caller {index}" for index in range(5)
+    )
+    assert all(service.get_request(rid).follow_up_reminder_sent for rid in ids)
+
+
+def test_parallel_dispatchers_never_share_a_claim(engine, session, service, notifier):
+    _due_requests(service, 3)
+    session.commit()
+    later = datetime.utcnow() + timedelta(minutes=10)
+    factory = sessionmaker(bind=engine, future=True)
+
+    first, second = factory(), factory()
+    first_claim = HelpRequestService(first).repo.claim_due_followups(later, limit=2)
+    first.commit()
+    second_claim = HelpRequestService(second).repo.claim_due_followups(later, limit=2)
+    second.commit()
+
+    assert len(first_claim) == 2
+    assert len(second_claim) == 1
+    assert not {r.id for r in first_claim} & {r.id for r in second_claim}
@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from app.db import Base
 from datetime import datetime, timedelta
 
 from app.services.help_requests import HelpRequestService
@@ -22,14 +18,7 @@ class DummyNotifier(NotificationSink):
         self.customer_notifications.append(payload)
 
 
-def _session():
-    engine = create_engine("sqlite+pysqlite:///:memory:", echo=False, future=True)
-    Base.metadata.create_all(bind=engine)
-    return sessionmaker(bind=engine, future=True)()
-
-
-def test_escalation_to_resolution():
-    session = _session()
+def test_escalation_to_resolution(session):
     notifier = DummyNotifier()
     service = HelpRequestService(session, notifier=notifier)
 
@@ -64,8 +53,7 @@ def test_escalation_to_resolution():
     assert kb_list[0].question == request.question
 
 
-def test_unresolved_response_schedules_follow_up():
-    session = _session()
+def test_unresolved_response_schedules_follow_up(session):
     notifier = DummyNotifier()
     service = HelpRequestService(session, notifier=notifier)
 
@@ -95,8 +83,7 @@ def test_unresolved_response_schedules_follow_up():
     assert timedelta(minutes=40) < follow_up_delta <= timedelta(minutes=46)
 
 
-def test_follow_up_reminder_dispatch():
-    session = _session()
+def test_follow_up_reminder_dispatch(session):
     notifier = DummyNotifier()
     service = HelpRequestService(session, notifier=notifier)
 
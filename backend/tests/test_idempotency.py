@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.models import IdempotencyKeyORM
+from app.services.help_requests import HelpRequestService
+from app.services.idempotency import IdempotencyService
+
+ESCALATION = {"customer_name": "Sam", "channel": "sms", "question": "Open late?"}
+
+
+def test_retried_escalation_is_replayed_not_rerun(client):
+    headers = {"Idempotency-Key": "call-42"}
+    first = client.post("/api/help-requests", json=ESCALATION, headers=headers)
+    retry = client.post("/api/help-requests", json=ESCALATION, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert len(client.get("/api/help-requests").json()) == 1
+
+    # Without a key (or with another one) every POST still creates a request.
+    client.post("/api/help-requests", json=ESCALATION)
+    client.post("/api/help-requests", json=ESCALATION, headers={"Idempotency-Key": "call-43"})
+    assert len(client.get("/api/help-requests").json()) == 3
+
+
+def test_retried_response_records_one_answer_and_one_kb_entry(client):
+    created = client.post("/api/help-requests", json=ESCALATION).json()
+    url = f"/api/help-requests/{created['id']}/response"
+    answer = {"answer": "Until 9pm.", "topic": "Hours"}
+    headers = {"Idempotency-Key": "answer-1"}
+
+    first = client.post(url, json=answer, headers=headers).json()
+    retry = client.post(url, json=answer, headers=headers).json()
+
+    assert retry == first
+    assert len(retry["responses"]) == 1
+    assert len(client.get("/api/knowledge-base").json()) == 1
+
+
+def test_key_reused_with_different_payload_is_rejected(client):
+    headers = {"Idempotency-Key": "call-42"}
+    client.post("/api/help-requests", json=ESCALATION, headers=headers)
+    other = client.post(
+        "/api/help-requests", json={**ESCALATION, "question": "Parking?"}, headers=headers
+    )
+    assert other.status_code == 422
+
+
+def test_failed_request_does_not_consume_the_key(client, monkeypatch):
+    created = client.post("/api/help-requests", json=ESCALATION).json()
+    url = f"/api/help-requests/{created['id']}/response"
+    headers = {"Idempotency-Key": "answer-1"}
+
+    def fail(self, request_id, **kwargs):
+        raise ValueError("supervisor backend unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(HelpRequestService, "record_response", fail)
+        failed = client.post(url, json={"answer": "Hi"}, headers=headers)
+    assert failed.status_code == 404
+
+    retry = client.post(url, json={"answer": "Hi"}, headers=headers)
+    assert retry.status_code == 200
+    assert "idempotent-replayed" not in retry.headers
+    assert [response["answer"] for response in retry.json()["responses"]] == ["Hi"]
+
+
+def test_expired_keys_are_taken_over_and_purged(session):
+    now = datetime(2024, 1, 1, 12, 0)
+    service = IdempotencyService(session, ttl_seconds=60)
+
+    assert service.begin("scope", "k", "{}", now=now) is None
+    service.complete("scope", "k", status_code=201, body='{"id":"a"}')
+    stored = service.begin("scope", "k", "{}", now=now + timedelta(seconds=30))
+    assert stored.body == '{"id":"a"}'
+
+    # Past its TTL the key behaves as new, even with a different payload.
+    assert service.begin("scope", "k", '{"x":1}', now=now + timedelta(seconds=61)) is None
+    service.begin("scope", "other", "{}", now=now)
+    assert service.purge_expired(now=now + timedelta(seconds=90)) == 1
+    assert [row.key for row in session.query(IdempotencyKeyORM)] == ["k"]
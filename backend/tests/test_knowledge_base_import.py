@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services import knowledge_base
+from app.services.knowledge_base import KnowledgeBaseImporter
+
+
+def test_import_upserts_in_chunks_and_refreshes_once(session, service, monkeypatch):
+    refreshes: list[int] = []
+    monkeypatch.setattr(knowledge_base, "_listeners", [lambda: refreshes.append(1)])
+    lines = [
+        '{"question": "Do you open on Sundays?", "answer": "No.", "topic": "Hours"}\n',
+        '{"question": "Do you sell gift cards?", "answer": "Yes, in store."}\n',
+        "\n",
+        '{"question": "do you  open on sundays?", "answer": "Yes, 10-4.", "topic": "Hours"}\n',
+    ]
+
+    result = KnowledgeBaseImporter(session, chunk_size=2).import_lines(lines, fmt="ndjson")
+    session.commit()
+
+    assert result.processed == 3
+    assert result.batches == 2
+    assert refreshes == [1]
+    entries = {entry.question.lower(): entry for entry in service.list_knowledge_base()}
+    assert len(entries) == 2
+    assert entries["do you  open on sundays?"].answer == "Yes, 10-4."
+    assert entries["do you sell gift cards?"].topic == "General"
+
+
+def test_import_csv_reports_invalid_rows(session):
+    lines = ["question,answer,topic\n", "Any parking?,,Location\n"]
+
+    with pytest.raises(ValueError, match="Line 2"):
+        KnowledgeBaseImporter(session).import_lines(lines, fmt="csv")
+
+
+@pytest.mark.parametrize(
+    "line, error",
+    [
+        ('{"question": "Walk-ins?", "answer": "Yes", "topic": ["Hours"]}', "must be a string"),
+        ('{"question": "Walk-ins?", "answer": "Yes", "topic": "%s"}' % ("x" * 81), "is longer than 80"),
+    ],
+)
+def test_import_rejects_invalid_topics(session, line, error):
+    with pytest.raises(ValueError, match=f"Line 1: 'topic' {error}"):
+        KnowledgeBaseImporter(session).import_lines([line], fmt="ndjson")
+
+
+def test_import_endpoint(client):
+    body = (
+        '{"question": "Walk-ins?", "answer": "Yes, until 6pm.", "topic": " Hours "}\n'
+        '{"question": "Gift cards?", "answer": "At the desk."}\n'
+    )
+    imported = client.post("/api/knowledge-base/import", content=body)
+    assert imported.status_code == 200
+    assert imported.json() == {"processed": 2, "batches": 1}
+    entries = {entry["question"]: entry for entry in client.get("/api/knowledge-base").json()}
+    assert entries["Walk-ins?"]["topic"] == "Hours"
+
+    rejected = client.post(
+        "/api/knowledge-base/import",
+        content='{"question": "Walk-ins?", "answer": "Yes", "topic": ["Hours"]}\n',
+    )
+    assert rejected.status_code == 400
+    assert rejected.json()["detail"] == "Line 1: 'topic' must be a string"
+
+    csv_rejected = client.post(
+        "/api/knowledge-base/import",
+        params={"format": "csv"},
+        content="question,answer\nParking?,\n",
+    )
+    assert csv_rejected.status_code == 400
+    assert csv_rejected.json()["detail"].startswith("Line 2:")
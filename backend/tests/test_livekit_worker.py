@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.livekit_worker import HOLDING_MESSAGE, handle_job
+from app.services.help_requests import HelpRequestService
+from app.services.notifications import NotificationSink
+from app.services.resolutions import ResolutionBroker
+
+
+class SlowNotifier(NotificationSink):
+    def __init__(self, inner: NotificationSink, delay: float) -> None:
+        self.inner = inner
+        self.delay = delay
+        self.finished_at: float | None = None
+
+    def notify_supervisor(self, payload) -> None:
+        time.sleep(self.delay)
+        self.inner.notify_supervisor(payload)
+        self.finished_at = time.perf_counter()
+
+    def notify_customer(self, payload) -> None:
+        self.inner.notify_customer(payload)
+
+
+class RecordingContext:
+    def __init__(self) -> None:
+        self.messages: list[tuple[float, str]] = []
+
+    async def send_message(self, message: str) -> None:
+        self.messages.append((time.perf_counter(), message))
+
+
+def test_holding_message_is_sent_before_escalation_finishes(bridge, notifier):
+    bridge.notifier = slow = SlowNotifier(notifier, delay=0.2)
+    ctx = RecordingContext()
+    job = SimpleNamespace(
+        input={"customer_name": "Morgan", "channel": "phone", "question": "Do you do perms?"}
+    )
+
+    timings = asyncio.run(
+        handle_job(job, ctx, bridge=bridge, resolution_wait_seconds=0)
+    )
+
+    assert [message for _, message in ctx.messages] == [HOLDING_MESSAGE]
+    assert ctx.messages[0][0] < slow.finished_at
+    assert timings.path == "escalated"
+    assert timings.escalation_ms >= 200
+    assert timings.time_to_first_reply_ms < timings.escalation_ms
+    assert timings.saved_ms > 0
+    assert len(notifier.supervisor_notifications) == 1
+
+
+def test_supervisor_answer_is_spoken_in_the_same_call(bridge, notifier):
+    ctx = RecordingContext()
+    job = SimpleNamespace(
+        input={"customer_name": "Quinn", "channel": "phone", "question": "Is there valet?"}
+    )
+
+    async def supervisor_answers():
+        while not notifier.supervisor_notifications:
+            await asyncio.sleep(0.01)
+
+        def respond():
+            with bridge.session_factory() as session:
+                service = HelpRequestService(session, notifier=notifier)
+                (pending,) = service.list_requests()
+                service.record_response(
+                    pending.id,
+                    answer="Yes, valet is free.",
+                    topic="Parking",
+                    unresolved=False,
+                    notes=None,
+                )
+
+        await asyncio.to_thread(respond)
+
+    async def scenario():
+        call = asyncio.create_task(
+            handle_job(job, ctx, bridge=bridge, resolution_wait_seconds=5)
+        )
+        await supervisor_answers()
+        return await call
+
+    timings = asyncio.run(scenario())
+
+    assert [message for _, message in ctx.messages] == [HOLDING_MESSAGE, "Yes, valet is free."]
+    assert timings.path == "resolved_in_call"
+    assert timings.resolution_ms < 5000
+
+
+def test_interim_answer_is_spoken_and_the_call_waits_for_the_final_one(bridge, notifier):
+    ctx = RecordingContext()
+    job = SimpleNamespace(
+        input={"customer_name": "Quinn", "channel": "phone", "question": "Is there valet?"}
+    )
+
+    def respond(answer: str, unresolved: bool) -> None:
+        with bridge.session_factory() as session:
+            service = HelpRequestService(session, notifier=notifier)
+            (request,) = service.list_requests()
+            service.record_response(
+                request.id, answer=answer, topic="Parking", unresolved=unresolved, notes=None
+            )
+
+    async def spoken(count: int) -> None:
+        while len(ctx.messages) < count:
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        call = asyncio.create_task(
+            handle_job(job, ctx, bridge=bridge, resolution_wait_seconds=5)
+        )
+        while not notifier.supervisor_notifications:
+            await asyncio.sleep(0.01)
+        await asyncio.to_thread(respond, "Checking with the valet desk.", True)
+        await asyncio.wait_for(spoken(2), timeout=5)
+        await asyncio.to_thread(respond, "Yes, valet is free.", False)
+        return await call
+
+    timings = asyncio.run(scenario())
+
+    assert [message for _, message in ctx.messages] == [
+        HOLDING_MESSAGE,
+        "Checking with the valet desk.",
+        "Yes, valet is free.",
+    ]
+    assert timings.path == "resolved_in_call"
+    assert timings.resolution_ms < 5000
+
+
+def test_wait_for_resolution_times_out(bridge):
+    request = bridge.escalate(customer_name="Ari", channel="sms", question="Braids?")
+
+    result = asyncio.run(bridge.wait_for_resolution(request.id, timeout=0.05))
+
+    assert result is None
+
+
+def test_answer_recorded_by_another_process_is_seen_when_the_wait_ends(bridge, notifier):
+    request = bridge.escalate(customer_name="Ari", channel="sms", question="Braids?")
+
+    def respond_elsewhere():
+        # A private broker stands in for the API process: nothing is published
+        # to the bridge, only the database row changes.
+        with bridge.session_factory() as session:
+            HelpRequestService(
+                session, notifier=notifier, resolutions=ResolutionBroker()
+            ).record_response(
+                request.id, answer="Yes, on Fridays.", topic="Services", unresolved=False, notes=None
+            )
+
+    async def scenario():
+        waiting = asyncio.create_task(bridge.wait_for_resolution(request.id, timeout=0.3))
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(respond_elsewhere)
+        return await waiting
+
+    result = asyncio.run(scenario())
+
+    assert result is not None
+    assert result.answer == "Yes, on Fridays."
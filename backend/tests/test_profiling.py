@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.livekit_worker import handle_job
+from app.profiling import profile_block, profile_store
+
+
+async def _discard(message: str) -> None:
+    pass
+
+
+def test_requests_are_only_profiled_when_asked(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "profiling_allow_header", True)
+    client.post(
+        "/api/help-requests",
+        json={"customer_name": "Sam", "channel": "sms", "question": "Open late?"},
+    )
+
+    plain = client.get("/api/help-requests")
+    assert "x-profile-id" not in plain.headers
+
+    profiled = client.get("/api/help-requests", headers={"X-Profile": "1"})
+    profile_id = profiled.headers["x-profile-id"]
+    assert "sql;dur=" in profiled.headers["server-timing"]
+
+    summary = client.get(f"/api/debug/profiles/{profile_id}").json()
+    assert summary["label"] == "GET /api/help-requests"
+    assert summary["sql"]["count"] >= 1
+    assert any("FROM help_requests" in stmt["statement"] for stmt in summary["sql"]["statements"])
+    # The sync endpoint ran in the threadpool and was still seen by cProfile.
+    assert any("list_help_requests" in row["function"] for row in summary["top_functions"])
+
+
+def test_header_is_ignored_unless_allowed(client):
+    response = client.get("/api/help-requests", headers={"X-Profile": "1"})
+    assert "x-profile-id" not in response.headers
+
+
+def test_profile_block_captures_sql(engine):
+    with profile_block("adhoc") as session:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert [query.statement for query in session.queries] == ["SELECT 1"]
+    assert profile_store.get(session.id)["label"] == "adhoc"
+
+
+def test_bridge_turns_are_profiled_when_enabled(bridge, monkeypatch):
+    monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+
+    bridge.handle_customer_question(customer_name="Ana", channel="phone", question="Parking?")
+
+    summary = profile_store.list()[0]
+    assert summary["label"] == "bridge.handle_customer_question"
+    assert any("INSERT INTO help_requests" in stmt["statement"] for stmt in summary["sql"]["statements"])
+
+
+def test_live_agent_turns_are_profiled_when_enabled(bridge, monkeypatch):
+    monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+    job = SimpleNamespace(input={"customer_name": "Ana", "question": "Parking?"})
+
+    asyncio.run(
+        handle_job(
+            job,
+            SimpleNamespace(send_message=_discard),
+            bridge=bridge,
+            resolution_wait_seconds=0,
+        )
+    )
+
+    summary = profile_store.list()[0]
+    assert summary["label"] == "livekit.handle_job"
+    assert any("INSERT INTO help_requests" in stmt["statement"] for stmt in summary["sql"]["statements"])
+    # The knowledge-base lookup and escalation ran in worker threads.
+    assert any("escalate" in row["function"] for row in summary["top_functions"])
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from sqlalchemy import update
+
+from app.cache import InMemoryTTLCache, ResponseCache
+from app.models import HelpRequestORM
+
+
+def test_in_memory_cache_evicts_lru_and_expired_entries(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: clock[0])
+    cache = InMemoryTTLCache(max_entries=2)
+
+    cache.set("a", b"1", ttl=10)
+    cache.set("b", b"2", ttl=10)
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3", ttl=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    clock[0] += 11
+    assert cache.get("c") is None
+
+
+def test_get_help_request_is_served_from_cache_until_a_write(client, engine):
+    created = client.post(
+        "/api/help-requests",
+        json={"customer_name": "Sam", "channel": "sms", "question": "Open late?"},
+    ).json()
+    first = client.get(f"/api/help-requests/{created['id']}").json()
+
+    # Change the row behind the service's back: the cached body must still win.
+    with engine.begin() as conn:
+        conn.execute(
+            update(HelpRequestORM)
+            .where(HelpRequestORM.id == created["id"])
+            .values(customer_name="Changed")
+        )
+    assert client.get(f"/api/help-requests/{created['id']}").json() == first
+
+    client.post(
+        f"/api/help-requests/{created['id']}/response",
+        json={"answer": "Until 9pm.", "topic": "Hours"},
+    )
+    refreshed = client.get(f"/api/help-requests/{created['id']}").json()
+    assert refreshed["status"] == "resolved"
+    assert refreshed["customer_name"] == "Changed"
+
+    kb = client.get("/api/knowledge-base").json()
+    assert [entry["answer"] for entry in kb] == ["Until 9pm."]
+
+
+def test_load_that_races_an_invalidation_is_not_cached():
+    cache = ResponseCache(InMemoryTTLCache(), ttl_seconds=60)
+    key = ResponseCache.key("help-request", request_id="a")
+
+    def stale_load() -> bytes:
+        # The writer commits and invalidates while this reader is loading.
+        cache.invalidate(key)
+        return b"stale"
+
+    assert cache.get_or_set(key, stale_load) == b"stale"
+    assert cache.get_or_set(key, lambda: b"fresh") == b"fresh"
+    assert cache.get_or_set(key, lambda: b"unused") == b"fresh"
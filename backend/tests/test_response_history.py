@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.models import HelpRequestORM, SupervisorResponseORM
+
+
+@contextmanager
+def count_queries(engine):
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _seed(session, count: int) -> None:
+    session.add_all(
+        HelpRequestORM(
+            customer_name=f"Customer {index}",
+            channel="sms",
+            question=f"Question {index}?",
+            responses=[
+                SupervisorResponseORM(answer="Checking.", topic="General", unresolved=True),
+                SupervisorResponseORM(answer=f"Answer {index}.", topic="General"),
+            ],
+        )
+        for index in range(count)
+    )
+    session.commit()
+    session.expunge_all()
+
+
+def test_listing_requests_loads_responses_in_constant_queries(engine, session, service):
+    _seed(session, 1000)
+
+    with count_queries(engine) as statements:
+        requests = service.list_requests()
+        exported = list(service.export_requests(fmt="ndjson", batch_size=500))
+
+    assert len(requests) == 1000
+    assert all(len(request.responses) == 2 for request in requests)
+    assert len(exported) == 1000
+    # list: one SELECT for requests plus selectinload's IN batches of 500;
+    # export: the same per yield_per batch. Never one query per request.
+    assert len(statements) <= 6, statements
+    # History order must not depend on the database's physical row order.
+    assert all(
+        "ORDER BY supervisor_responses.created_at, supervisor_responses.id" in statement
+        for statement in statements
+        if "FROM supervisor_responses" in statement
+    )
+
+
+def test_request_detail_includes_response_history(client):
+    created = client.post(
+        "/api/help-requests",
+        json={"customer_name": "Sam", "channel": "sms", "question": "Open late?"},
+    ).json()
+    assert created["responses"] == []
+
+    client.post(
+        f"/api/help-requests/{created['id']}/response",
+        json={"answer": "Let me check.", "topic": "Hours", "unresolved": True},
+    )
+    updated = client.post(
+        f"/api/help-requests/{created['id']}/response",
+        json={"answer": "Until 9pm.", "topic": "Hours"},
+    ).json()
+    assert [response["answer"] for response in updated["responses"]] == [
+        "Let me check.",
+        "Until 9pm.",
+    ]
+
+    detail = client.get(f"/api/help-requests/{created['id']}").json()
+    assert detail["responses"] == updated["responses"]
+    listed = client.get("/api/help-requests").json()
+    assert listed[0]["responses"] == updated["responses"]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.services.retention import ArchivalService
+
+
+def test_archive_moves_old_closed_requests_in_batches(tmp_path, session, service):
+    requests = [
+        service.create_escalation(
+            customer_name=f"Caller {index}",
+            question=f"Question {index}?",
+            channel="sms",
+            customer_contact=None,
+        )
+        for index in range(4)
+    ]
+    for request in requests[:3]:
+        service.record_response(
+            request.id, answer="Done.", topic="General", unresolved=False, notes=None
+        )
+    session.commit()
+
+    archival = ArchivalService(
+        session, retention_days=30, batch_size=2, archive_dir=str(tmp_path)
+    )
+    result = archival.archive_expired(now=datetime.utcnow() + timedelta(days=31))
+
+    assert result.archived == 3
+    assert result.batches == 2
+    with gzip.open(result.path, "rt", encoding="utf-8") as archive:
+        lines = [json.loads(line) for line in archive]
+    assert {line["id"] for line in lines} == {request.id for request in requests[:3]}
+    assert all(len(line["responses"]) == 1 for line in lines)
+    remaining = service.list_requests()
+    assert [item.id for item in remaining] == [requests[3].id]
+
+
+def test_archive_is_noop_without_retention(tmp_path, session):
+    result = ArchivalService(session, archive_dir=str(tmp_path)).archive_expired()
+
+    assert result.archived == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_archiving_a_primary_detaches_its_open_followers(tmp_path, session, service):
+    primary = service.create_escalation(
+        customer_name="Ana", question="Open today?", channel="sms", customer_contact=None
+    )
+    follower = service.create_escalation(
+        customer_name="Ben", question="Open today?", channel="sms", customer_contact=None
+    )
+    assert follower.coalesced_into == primary.id
+    service.mark_timeout(primary.id)
+    session.commit()
+    if session.get_bind().dialect.name == "sqlite":
+        # Enforce the foreign key the way Postgres does.
+        session.execute(text("PRAGMA foreign_keys = ON"))
+
+    result = ArchivalService(
+        session, retention_days=30, archive_dir=str(tmp_path)
+    ).archive_expired(now=datetime.utcnow() + timedelta(days=31))
+
+    assert result.archived == 1
+    remaining = service.get_request(follower.id)
+    assert remaining.status == "pending"
+    assert remaining.coalesced_into is None
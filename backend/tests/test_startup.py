@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_startup import LAZY_CHECK
+
+
+@pytest.mark.parametrize("module", ["app.main", "app.livekit_worker"])
+def test_entry_points_do_not_touch_settings_or_engine_at_import(module):
+    subprocess.run(
+        [sys.executable, "-c", LAZY_CHECK.format(module=module)],
+        cwd=Path(__file__).resolve().parent.parent,
+        check=True,
+    )
+
+
+def test_worker_import_skips_service_stack():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.livekit_worker; print('sqlalchemy' in sys.modules)",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
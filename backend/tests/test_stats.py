@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from app.models import HelpRequestORM
+from app.profiling import profile_block
+from app.services.stats import StatsService
+
+
+def _escalate(service, name: str, channel: str, question: str):
+    return service.create_escalation(
+        customer_name=name, question=question, channel=channel, customer_contact=None
+    )
+
+
+def test_counters_follow_service_writes_and_match_a_rebuild(service, session):
+    answered = _escalate(service, "Ana", "sms", "Do you sell gift cards?")
+    parked = _escalate(service, "Ben", "phone", "Can I bring my dog?")
+    timed_out = _escalate(service, "Cy", "sms", "Is there parking?")
+    session.get(HelpRequestORM, answered.id).escalated_at = datetime.utcnow() - timedelta(
+        seconds=100
+    )
+    service.record_response(
+        answered.id, answer="Yes, at the desk.", topic="Gifts", unresolved=False, notes=None
+    )
+    service.record_response(
+        parked.id, answer="Checking.", topic="Policies", unresolved=True, notes=None
+    )
+    service.mark_timeout(timed_out.id)
+    session.commit()
+
+    stats = StatsService(session)
+    summary = stats.summary()
+    assert summary.total == 3
+    assert summary.by_status == {"pending": 0, "resolved": 1, "unresolved": 2}
+    assert summary.by_channel == {"sms": 2, "phone": 1}
+    assert summary.by_topic == {"Gifts": 1, "Policies": 1}
+    assert summary.resolution_rate == 1 / 3
+    latency = summary.time_to_resolve
+    assert latency.count == 1
+    assert 99 <= latency.mean_seconds <= 102
+    assert 60 <= latency.percentiles["p50"] <= 120
+
+    assert asdict(stats.rebuild()) == asdict(summary)
+
+
+def test_writes_only_append_events_and_reads_fold_them(service, session):
+    with profile_block("escalate") as profile:
+        _escalate(service, "Ana", "sms", "Do you sell gift cards?")
+    session.commit()
+    # No shared counter row is locked by the request's own transaction.
+    assert not any("stat_counters" in query.statement for query in profile.queries)
+
+    stats = StatsService(session)
+    assert stats.summary().by_status["pending"] == 1
+    session.commit()
+
+    with profile_block("stats") as profile:
+        assert stats.summary().total == 1
+
+    statements = [query.statement for query in profile.queries]
+    assert len(statements) == 3
+    assert not any("help_requests" in statement for statement in statements)
+
+
+def test_percentiles_stay_within_the_observed_durations(service, session):
+    for index in range(20):
+        request = _escalate(service, f"C{index}", "sms", f"Question {index}?")
+        orm = session.get(HelpRequestORM, request.id)
+        orm.escalated_at = datetime.utcnow() - timedelta(milliseconds=20 + index)
+        service.record_response(
+            request.id, answer="Yes.", topic="General", unresolved=False, notes=None
+        )
+    session.commit()
+
+    latency = StatsService(session).summary().time_to_resolve
+    assert latency.count == 20
+    for value in latency.percentiles.values():
+        assert 0.02 <= value <= 1.0
+
+
+def test_stats_endpoint(client):
+    created = client.post(
+        "/api/help-requests",
+        json={"customer_name": "Sam", "channel": "sms", "question": "Open late?"},
+    ).json()
+    client.post(
+        f"/api/help-requests/{created['id']}/response",
+        json={"answer": "Until 9pm.", "topic": "Hours"},
+    )
+
+    body = client.get("/api/stats").json()
+    assert body["by_status"]["resolved"] == 1
+    assert body["by_topic"] == {"Hours": 1}
+    assert body["resolution_rate"] == 1.0
+    assert body["time_to_resolve"]["count"] == 1
+    assert set(body["time_to_resolve"]["percentiles"]) == {"p50", "p90", "p95", "p99"}
+
+
+def test_time_to_resolve_ends_at_the_resolving_answer(service, session):
+    request = _escalate(service, "Ana", "sms", "Do you sell gift cards?")
+    service.mark_timeout(request.id)
+    orm = session.get(HelpRequestORM, request.id)
+    orm.escalated_at = datetime.utcnow() - timedelta(hours=5)
+    orm.resolved_at = orm.escalated_at + timedelta(minutes=30)
+
+    service.record_response(
+        request.id, answer="Yes, at the desk.", topic="Gifts", unresolved=False, notes=None
+    )
+    session.commit()
+
+    latency = StatsService(session).summary().time_to_resolve
+    assert latency.count == 1
+    assert 5 * 3600 - 5 <= latency.mean_seconds <= 5 * 3600 + 5